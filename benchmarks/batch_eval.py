@@ -0,0 +1,129 @@
+"""
+Screening cost of a websocket ``new_item`` push in BiddingBot, network excluded.
+
+Compares the pre-batch path (one ``_consider_new_item`` coroutine per pushed
+item through ``asyncio.gather``, each doing its own lookup and comparisons;
+kept below as ``legacy_consider``) with ``_screen_new_items``, in plain Python
+and, when NumPy is installed, vectorised. Bids are not placed: the legacy
+coroutines stop where they would call ``_place_bid``, and the batch path
+returns its survivors, so what's timed is the screening alone.
+
+The synthetic push mirrors an ``init`` burst: PER_PAGE items over a pool of
+market names of which only ``--tracked`` are in the PriceIndex (a few of those
+stale), values around our valuations so some pass and some don't:
+
+    python -m benchmarks.batch_eval
+    python -m benchmarks.batch_eval --sizes 1 16 64 256 1024 2500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import bidding_bot
+from bidding_bot import PER_PAGE, PRICE_MAX_AGE, BiddingBot
+
+
+def synthetic_push(items: int, names: int, tracked: int,
+                   seed: int = 1) -> tuple[list[dict], list[tuple]]:
+    """(push, price rows): ``items`` pushed items over ``names`` market names,
+    the first ``tracked`` of which have a price row (every tenth stale)."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = []
+    for i in range(tracked):
+        age = PRICE_MAX_AGE * (2 if i % 10 == 9 else rng.random() * 0.5)
+        rows.append((f"Item {i}", rng.randint(100, 50_000),
+                     now - timedelta(seconds=age)))
+    push = []
+    for i in range(items):
+        name = rng.randrange(names)
+        base = rows[name][1] if name < tracked else rng.randint(100, 50_000)
+        push.append({"id": 300_000_000 + i, "market_name": f"Item {name}",
+                     "market_value": int(base * rng.uniform(0.8, 1.2)),
+                     "auction_ends_at": 1_760_000_000 + rng.randint(0, 180)})
+    return push, rows
+
+
+async def legacy_consider(bot: BiddingBot, item: dict, survivors: list) -> None:
+    """The per-item screening of the old ``_consider_new_item``."""
+    item_id = item.get("id")
+    market_name = item.get("market_name")
+    market_value = item.get("market_value")
+    if item_id is None or market_name is None or market_value is None:
+        return
+    bid_max = bot._fresh_bid_max(market_name)
+    if bid_max is None:
+        return
+    if bid_max < market_value:
+        return
+    if market_value > bot._balance:
+        return
+    survivors.append((item, bid_max))
+
+
+async def legacy_screen(bot: BiddingBot, push: list[dict]) -> list:
+    survivors = []
+    await asyncio.gather(*(legacy_consider(bot, item, survivors) for item in push))
+    return survivors
+
+
+def measure(run, repeats: int) -> float:
+    run()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        run()
+    return (time.perf_counter() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1, 16, 64, 256, 1024, PER_PAGE])
+    parser.add_argument("--names", type=int, default=5000,
+                        help="distinct market names in the pushes")
+    parser.add_argument("--tracked", type=int, default=45,
+                        help="names with a price row")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    # Screening only logs [skip] lines; keep them out of the timing.
+    bidding_bot.logger.info = lambda *a, **k: None
+    numpy = bidding_bot.np
+    loop = asyncio.new_event_loop()
+    bot = BiddingBot(empire=None, db=None)
+    bot._ledger.sync(10**9)
+    print(f"{args.tracked} tracked of {args.names} names; "
+          f"NumPy {'available' if numpy is not None else 'not installed'}; "
+          f"VECTOR_MIN_BATCH {bidding_bot.VECTOR_MIN_BATCH}")
+    print(f"  {'items':>6}  {'gather/item':>12}  {'batch py':>10}  "
+          f"{'batch numpy':>11}  {'survivors':>9}")
+    try:
+        for size in args.sizes:
+            push, rows = synthetic_push(size, args.names, args.tracked)
+            bot._prices._positions, bot._prices._names, bot._prices._rows = {}, [], []
+            bot._prices._apply(rows)
+            legacy = measure(lambda: loop.run_until_complete(legacy_screen(bot, push)),
+                             args.repeats)
+            expected = loop.run_until_complete(legacy_screen(bot, push))
+            timings = {}
+            for name, backend, threshold in (("py", None, 0), ("numpy", numpy, 0)):
+                if name == "numpy" and numpy is None:
+                    continue
+                bidding_bot.np, bidding_bot.VECTOR_MIN_BATCH = backend, threshold
+                survivors = bot._screen_new_items(push)
+                assert sorted(i["id"] for i, _ in survivors) == \
+                    sorted(i["id"] for i, _ in expected), "batch path disagrees"
+                timings[name] = measure(lambda: bot._screen_new_items(push), args.repeats)
+            numpy_ms = (f"{timings['numpy'] * 1e3:8.3f} ms" if "numpy" in timings
+                        else f"{'—':>11}")
+            print(f"  {size:>6}  {legacy * 1e3:9.3f} ms  "
+                  f"{timings['py'] * 1e3:7.3f} ms  {numpy_ms}  {len(expected):>9}")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
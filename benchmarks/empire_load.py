@@ -0,0 +1,189 @@
+"""
+Load benchmark for CSGOEmpireClient against the local Empire stand-in.
+
+Drives the mix TradeBot and BiddingBot put on one API key through a real
+client, over HTTP, into ``benchmarks.empire_standin`` (which enforces Empire's
+limits and the 60s block):
+
+    TradeBot    GET /trading/user/trades every 5s, automation status every 30s,
+                mark_as_received at PRIORITY_HIGH (Poisson, --receipts per s)
+    BiddingBot  GET /trading/user/auctions every 10s, fresh metadata every 60s,
+                bursts of 1-5 bids at PRIORITY_BID (fail_fast_429, deadline
+                BID_MAX_WAIT) arriving as a Poisson process (--bid-bursts per s)
+
+Rates are in Empire time; ``--scale`` compresses all windows (server and
+client), the 429 block and the workload by the same factor, so the default
+run covers 10 minutes of Empire time in 20s. Retry backoff after 5xx is not
+scaled, and loopback overhead is scaled up with everything else, so latencies
+at high --scale read a little pessimistic. Reports requests/min (Empire time),
+429s seen by the server and by the client, and per-priority end-to-end latency
+(queue wait included) in Empire milliseconds:
+
+    python -m benchmarks.empire_load
+    python -m benchmarks.empire_load --load 2 --latency 0.15 --jitter 0.1 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+from benchmarks.empire_standin import EmpireStandIn
+from csgoempire_client import (PRIORITY_BID, PRIORITY_HIGH, PRIORITY_NORMAL,
+                               CSGOEmpireClient, CSGOEmpireError,
+                               DeadlineExceeded)
+from metrics import HistogramSet
+
+# bidding_bot.BID_MAX_WAIT (not imported: bidding_bot pulls in the DB driver).
+BID_MAX_WAIT = 10.0
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_BID: "bid",
+                  PRIORITY_NORMAL: "normal"}
+
+
+class _Load:
+    """Workload generator; every call is timed and its outcome counted."""
+
+    def __init__(self, client: CSGOEmpireClient, args: argparse.Namespace):
+        self.client = client
+        self.scale = args.scale
+        self.load = args.load
+        self.receipts = args.receipts
+        self.bid_bursts = args.bid_bursts
+        self.rng = random.Random(args.seed)
+        self.latency = HistogramSet()
+        self.outcomes: Counter = Counter()
+        self._tasks: set[asyncio.Task] = set()
+        self._next_id = 1
+
+    async def _timed(self, priority: int, call) -> None:
+        started = time.monotonic()
+        try:
+            await call
+        except DeadlineExceeded:
+            self.outcomes[(priority, "dropped")] += 1
+            return
+        except CSGOEmpireError as err:
+            self.outcomes[(priority, str(err.status or "error"))] += 1
+            return
+        # Back in Empire time so percentiles read the same at any --scale.
+        self.latency.observe(priority, (time.monotonic() - started) * self.scale)
+        self.outcomes[(priority, "ok")] += 1
+
+    def _spawn(self, priority: int, call) -> None:
+        task = asyncio.create_task(self._timed(priority, call))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _every(self, seconds: float, priority: int, make_call) -> None:
+        while True:
+            self._spawn(priority, make_call())
+            await asyncio.sleep(seconds / self.load / self.scale)
+
+    async def _poisson(self, rate: float, fire) -> None:
+        while True:
+            await asyncio.sleep(self.rng.expovariate(rate * self.load) / self.scale)
+            fire()
+
+    def _receipt(self) -> None:
+        self._next_id += 1
+        self._spawn(PRIORITY_HIGH, self.client.mark_as_received(self._next_id))
+
+    def _bid_burst(self) -> None:
+        for _ in range(self.rng.randint(1, 5)):
+            self._next_id += 1
+            deadline = time.monotonic() + BID_MAX_WAIT / self.scale
+            self._spawn(PRIORITY_BID, self.client.place_bid(
+                self._next_id, 1000, fail_fast_429=True, deadline=deadline))
+
+    async def run(self, duration: float) -> None:
+        client = self.client
+        loops = [
+            self._every(5.0, PRIORITY_NORMAL, client.get_active_trades),
+            self._every(30.0, PRIORITY_NORMAL, client.get_automation_status),
+            self._every(10.0, PRIORITY_NORMAL, client.get_active_auctions),
+            self._every(60.0, PRIORITY_NORMAL,
+                        lambda: client.get_metadata(fresh=True)),
+            self._poisson(self.receipts, self._receipt),
+            self._poisson(self.bid_bursts, self._bid_burst),
+        ]
+        drivers = [asyncio.create_task(loop) for loop in loops]
+        await asyncio.sleep(duration)
+        for task in drivers + list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*drivers, *self._tasks, return_exceptions=True)
+
+
+def _scale_client(client: CSGOEmpireClient, scale: float) -> None:
+    client._limiter.set_window(client._limiter.window / scale)
+    for limiter in client._endpoint_limiters.values():
+        limiter.set_window(limiter.window / scale)
+
+
+async def bench(args: argparse.Namespace) -> None:
+    server = EmpireStandIn(latency=args.latency / args.scale,
+                           jitter=args.jitter / args.scale,
+                           error_rate=args.error_rate, time_scale=args.scale,
+                           seed=args.seed)
+    port = await server.start()
+    client = CSGOEmpireClient("standin", host=f"127.0.0.1:{port}", scheme="http",
+                              adaptive_global=args.adaptive)
+    _scale_client(client, args.scale)
+    load = _Load(client, args)
+    try:
+        async with client:
+            await load.run(args.duration)
+    finally:
+        await server.stop()
+
+    empire_seconds = args.duration * args.scale
+    answered = sum(n for status, n in server.stats.items())
+    client_429 = sum(statuses.get(429, 0) for statuses
+                     in client.request_stats()["statuses"].values())
+    print(f"{args.duration:.0f}s wall = {empire_seconds:.0f}s Empire time, "
+          f"load x{args.load}, scale x{args.scale}")
+    print(f"  server answered  {answered} "
+          f"({answered / empire_seconds * 60:.1f}/min Empire time)  "
+          f"statuses {dict(sorted(server.stats.items()))}")
+    print(f"  429s             server {server.stats[429]}, client saw {client_429}")
+    print(f"  {'priority':<8} {'ok':>6} {'dropped':>8} {'failed':>7} "
+          f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    snapshot = load.latency.snapshot()
+    for priority, name in PRIORITY_NAMES.items():
+        outcomes = {kind: n for (p, kind), n in load.outcomes.items()
+                    if p == priority}
+        ok = outcomes.pop("ok", 0)
+        dropped = outcomes.pop("dropped", 0)
+        failed = sum(outcomes.values())
+        lat = snapshot.get(str(priority), {})
+        print(f"  {name:<8} {ok:>6} {dropped:>8} {failed:>7} "
+              f"{lat.get('p50_ms', 0):>9.1f} {lat.get('p90_ms', 0):>9.1f} "
+              f"{lat.get('p99_ms', 0):>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=20.0,
+                        help="wall-clock seconds to run")
+    parser.add_argument("--scale", type=float, default=30.0,
+                        help="Empire seconds per wall-clock second")
+    parser.add_argument("--load", type=float, default=1.0,
+                        help="multiplier on every workload rate")
+    parser.add_argument("--receipts", type=float, default=0.2,
+                        help="mark_as_received calls per Empire second")
+    parser.add_argument("--bid-bursts", type=float, default=0.3,
+                        help="bid bursts per Empire second")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="server latency per request, Empire seconds")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="extra uniform latency, Empire seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--adaptive", action="store_true",
+                        help="run the client with adaptive_global=True")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Local stand-in for the CSGOEmpire REST API, for load-testing CSGOEmpireClient.
+
+We can't load-test against Empire itself: one 429 blocks every endpoint for 60
+seconds. This aiohttp app serves every endpoint CSGOEmpireClient calls with
+plausible canned bodies and enforces Empire's rules as documented:
+
+    - global limit per key (default 120 / 60s)
+    - per-endpoint limits (bid 20/10s, trades 3/10s, deposit 20/10s, ...)
+    - any 429 blocks ALL endpoints for ``block`` seconds (default 60), and
+      every 429 carries Retry-After
+
+plus injectable latency (base + uniform jitter) and a 5xx rate. All windows
+can be divided by ``time_scale`` so a minute of Empire time runs in seconds.
+
+Standalone (then point a client at it with host="127.0.0.1:8090",
+scheme="http"):
+
+    python -m benchmarks.empire_standin --port 8090 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, deque
+from typing import Optional
+
+from aiohttp import web
+
+from csgoempire_client import CSGOEmpireClient
+
+# Empire's documented caps (the client's ROUTES limits sit just under these).
+DOCUMENTED_LIMITS: dict[str, tuple[int, float]] = {
+    "POST /trading/deposit/<id>/bid":  (20, 10.0),
+    "GET /trading/user/trades":        (3, 10.0),
+    "POST /trading/deposit":           (20, 10.0),
+}
+
+API = "/api/v2"
+
+
+class _Window:
+    __slots__ = ("max_requests", "window", "hits")
+
+    def __init__(self, max_requests: int, window: float):
+        self.max_requests = max_requests
+        self.window = window
+        self.hits: deque[float] = deque()
+
+    def admit(self, now: float) -> bool:
+        while self.hits and self.hits[0] + self.window <= now:
+            self.hits.popleft()
+        if len(self.hits) >= self.max_requests:
+            return False
+        self.hits.append(now)
+        return True
+
+
+class EmpireStandIn:
+    """The stand-in server; ``stats`` counts responses by status and endpoint."""
+
+    def __init__(self, *, global_limit: tuple[int, float] = (120, 60.0),
+                 endpoint_limits: Optional[dict[str, tuple[int, float]]] = None,
+                 block: float = 60.0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, time_scale: float = 1.0,
+                 seed: Optional[int] = None):
+        limits = DOCUMENTED_LIMITS if endpoint_limits is None else endpoint_limits
+        self._global = _Window(global_limit[0], global_limit[1] / time_scale)
+        self._endpoints = {key: _Window(m, w / time_scale)
+                           for key, (m, w) in limits.items()}
+        self.block = block / time_scale
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._blocked_until = 0.0
+        self._rng = random.Random(seed)
+        self.stats: Counter = Counter()
+        self.by_endpoint: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self._next_id = 100_000
+
+    # ------------------------------------------------------------------ #
+    # lifecycle
+    # ------------------------------------------------------------------ #
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._limits])
+        app.router.add_route("HEAD", "/", self._ok)
+        get, post = "GET", "POST"
+        for method, path, handler in (
+            (get, "/metadata/socket", self._metadata),
+            (get, "/trading/automation/status", self._automation_status),
+            ("PUT", "/trading/automation/access-token", self._ok),
+            ("DELETE", "/trading/automation/access-token", self._ok),
+            (post, "/trading/automation/check-trades", self._ok),
+            (get, "/trading/user/trades", self._trades),
+            (get, "/trading/user/trade/{id:\\d+}/{type}", self._ok),
+            (get, "/trading/user/auctions", self._auctions),
+            (post, "/trading/deposit", self._deposit),
+            (post, "/trading/deposit/cancel", self._ok),
+            ("PATCH", "/trading/deposit/bulk", self._ok),
+            (get, "/trading/deposit/status/{code}", self._ok),
+            (post, "/trading/deposit/{id:\\d+}/{action}", self._ok),
+            (get, "/trading/deposit/{id:\\d+}/stats", self._ok),
+            ("PATCH", "/trading/deposit/{id:\\d+}", self._ok),
+            (get, "/trading/items", self._items),
+            (get, "/trading/user/inventory", self._items),
+            (get, "/trading/block-list", self._ok),
+            (post, "/trading/block-list/{steam_id}", self._ok),
+            ("DELETE", "/trading/block-list/{steam_id}", self._ok),
+            (post, "/trading/user/settings", self._ok),
+            (get, "/user/transactions", self._items),
+            (post, "/user/tip", self._ok),
+        ):
+            app.router.add_route(method, API + path, handler)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Serve in the background; returns the bound port."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ------------------------------------------------------------------ #
+    # Empire's rules
+    # ------------------------------------------------------------------ #
+    def _too_many(self, now: float) -> web.Response:
+        self._blocked_until = max(self._blocked_until, now + self.block)
+        retry_after = max(1, round(self._blocked_until - now))
+        return web.json_response(
+            {"success": False, "message": "Too many requests."}, status=429,
+            headers={"Retry-After": str(retry_after)})
+
+    @web.middleware
+    async def _limits(self, request: web.Request, handler) -> web.StreamResponse:
+        if not request.path.startswith(API):
+            return await handler(request)
+        endpoint = CSGOEmpireClient._endpoint_key(request.method,
+                                                  request.path[len(API):])
+        self.by_endpoint[endpoint] += 1
+        now = time.monotonic()
+        bucket = self._endpoints.get(endpoint)
+        if (now < self._blocked_until or not self._global.admit(now)
+                or (bucket is not None and not bucket.admit(now))):
+            response = self._too_many(now)
+        else:
+            delay = self.latency + self._rng.uniform(0.0, self.jitter)
+            if delay:
+                await asyncio.sleep(delay)
+            if self._rng.random() < self.error_rate:
+                response = web.json_response(
+                    {"success": False, "message": "Server error"},
+                    status=self._rng.choice((500, 502, 503)))
+            else:
+                response = await handler(request)
+        self.stats[response.status] += 1
+        return response
+
+    # ------------------------------------------------------------------ #
+    # canned bodies
+    # ------------------------------------------------------------------ #
+    async def _ok(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True})
+
+    async def _metadata(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "user": {"id": 1, "steam_name": "standin", "balance": 1_000_000},
+            "socket_token": "token", "socket_signature": "signature",
+        })
+
+    async def _automation_status(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True, "data": {
+            "has_access_token": True,
+            "access_token_expires_at": "2099-01-01T00:00:00Z"}})
+
+    async def _trades(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True,
+                                  "data": {"deposits": [], "withdrawals": []}})
+
+    async def _auctions(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True, "active_auctions": []})
+
+    async def _deposit(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        deposits = []
+        for item in body.get("items", []):
+            self._next_id += 1
+            deposits.append({"id": self._next_id, "item_id": item.get("id"),
+                             "success": True})
+        return web.json_response({"success": True, "deposits": deposits})
+
+    async def _items(self, request: web.Request) -> web.Response:
+        per_page = int(request.query.get("per_page", 100))
+        page = int(request.query.get("page", 1))
+        last_page = 3
+        count = per_page if page < last_page else per_page // 2
+        data = [{"id": page * 10_000 + i, "market_name": f"Item {i}",
+                 "market_value": 100 + i} for i in range(count if page <= last_page else 0)]
+        return web.json_response({"current_page": page, "last_page": last_page,
+                                  "per_page": per_page, "data": data})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = EmpireStandIn(latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, time_scale=args.time_scale)
+    port = await server.start(args.host, args.port)
+    print(f"Empire stand-in on http://{args.host}:{port}{API} — Ctrl+C to stop")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(dict(server.stats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
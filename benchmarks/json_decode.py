@@ -0,0 +1,105 @@
+"""
+Decode benchmark for CSGOEmpireClient._parse on large Empire bodies.
+
+Compares the old path (bytes -> str -> stdlib json, what ``resp.json()`` /
+``resp.text()`` did) with the current one (``json_loads`` straight from the
+bytes: orjson when installed, else stdlib). Reports mean decode time, peak
+traced memory during a decode and what the decoded result keeps afterwards.
+orjson builds its own document tree before the Python objects, so its peak
+is several times the stdlib's (~34 vs ~7 MB on the 2.4 MB synthetic page)
+while the result is the same size (~5 MB): the extra is transient, and
+decodes run one at a time on the loop. Feeds on a recorded body if given,
+otherwise on a synthetic ``GET /trading/items?per_page=2500`` page shaped
+like the real one:
+
+    python -m benchmarks.json_decode
+    python -m benchmarks.json_decode --payload recorded_items_page.json
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable
+
+import csgoempire_client
+from csgoempire_client import json_loads
+
+
+def synthetic_items_page(items: int, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    data = []
+    for i in range(items):
+        value = rng.randint(30, 500_000)
+        data.append({
+            "id": 300_000_000 + i,
+            "market_name": f"AK-47 | Redline (Field-Tested) #{i}",
+            "market_value": value,
+            "suggested_price": int(value * 0.95),
+            "wear": round(rng.random(), 16),
+            "above_recommended_price": round(rng.uniform(-10, 20), 2),
+            "auction_ends_at": 1_760_000_000 + rng.randint(0, 180),
+            "auction_highest_bid": value if rng.random() < 0.4 else None,
+            "auction_highest_bidder": rng.randint(1, 10**7) if rng.random() < 0.4 else None,
+            "auction_number_of_bids": rng.randint(0, 12),
+            "published_at": "2026-10-18T12:00:00.000000Z",
+            "icon_url": "-9a81dlWLwJ2UUGcVs_nsVtzdOEdtWwKGZZLQHTxDZ7I56KU0Zwwo4NUX4oFJZEHLbXH5ApeO4YmlhxYQknCRvCo04DEVlxkKgpot7HxfDhjxszJemkV09-5lpKKqPrxN7LEmyVQ7MEpiLuSrYmnjQO3-UdsZGHyd4_Bd1RvNQ7T_FDrw-_ng5Pu75iY1zI97bhLsvQz",
+            "stickers": [{"sticker_id": rng.randint(1, 9000),
+                          "wear": None, "name": "Sticker | Team Liquid | Katowice 2015"}
+                         for _ in range(rng.randint(0, 4))],
+            "depositor_stats": {"delivery_rate_recent": rng.random(),
+                                "delivery_rate_long": rng.random(),
+                                "delivery_time_minutes_recent": rng.randint(1, 30),
+                                "steam_level_min_range": 5,
+                                "user_has_trade_notifications_enabled": True},
+        })
+    return json.dumps({"current_page": 1, "per_page": items, "total": items,
+                       "data": data}).encode()
+
+
+def old_path(body: bytes):
+    return json.loads(body.decode("utf-8"))
+
+
+def measure(decode: Callable[[bytes], object], body: bytes,
+            repeats: int) -> tuple[float, int, int]:
+    """(seconds per decode, peak bytes during one, bytes its result keeps)."""
+    decode(body)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decode(body)
+    elapsed = (time.perf_counter() - start) / repeats
+    tracemalloc.start()
+    result = decode(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payload", help="recorded response body (JSON file)")
+    parser.add_argument("--items", type=int, default=2500)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, "rb") as f:
+            body = f.read()
+    else:
+        body = synthetic_items_page(args.items)
+    backend = ("orjson" if csgoempire_client.json_loads is not json.loads
+               else "stdlib")
+    print(f"payload {len(body) / 1e6:.2f} MB, current backend: {backend}")
+
+    for name, decode in (("old: bytes->str->json.loads", old_path),
+                         (f"new: json_loads(bytes) [{backend}]", json_loads)):
+        elapsed, peak, retained = measure(decode, body, args.repeats)
+        print(f"  {name:<36} {elapsed * 1e3:8.1f} ms/decode  "
+              f"peak {peak / 1e6:7.1f} MB  result {retained / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Discrete-event simulator for Empire rate-limiter policies.
+
+Tuning ROUTES limits, the global window and the priority tiers by watching
+production is slow and risks 60s blocks. This replays a request trace through
+candidate limiter configurations on a virtual clock — the real _RateLimiter,
+but on an event loop whose time jumps straight to the next timer instead of
+sleeping — so an hour of traffic takes well under a second of CPU per policy.
+
+Trace: JSON lines {"t": epoch or offset seconds, "endpoint": "POST
+/trading/deposit/<id>/bid", "priority": 1, "deadline": seconds or null}, as
+written by CSGOEmpireClient(trace_file=...) (--trace). Without one, a
+synthetic trace of the TradeBot + BiddingBot mix is generated, with the same
+rates as benchmarks.empire_load; --write-trace saves it.
+
+The server model is the stand-in's (benchmarks.empire_standin): Empire's
+documented global and endpoint windows, counted when a request arrives
+(grant + --latency / --jitter), and any 429 blocking everything for 60s. The
+simulated client reacts like CSGOEmpireClient: Retry-After pauses its
+limiter, bids fail fast, everything else retries up to 3 times. Coalescing
+and caching happen before the limiter, so recorded traces already include
+them; synthetic ones leave them out.
+
+Per policy it reports requests sent, 429s the server would have returned,
+the share of the server's global budget used, and per priority the grant
+latency (arrival at the limiter to slot granted), p50 / p99 / max, and
+deadline drops:
+
+    python -m benchmarks.limiter_sim
+    python -m benchmarks.limiter_sim --hours 4 --load 2 --server-window 10
+    python -m benchmarks.limiter_sim --trace logs/empire_trace.jsonl --policy tight.json
+
+A policy file is {"name", "global": [120, 60], "reserved": {"0": 5, "1": 20},
+"weights": {...} (optional), "limits": {"POST /trading/deposit/<id>/bid":
+[18, 10], ...}}; limits not listed keep their ROUTES values.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import selectors
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from benchmarks.empire_standin import DOCUMENTED_LIMITS, _Window
+from csgoempire_client import (GLOBAL_RESERVED, PRIORITY_BID, PRIORITY_HIGH,
+                               PRIORITY_NORMAL, ROUTES, DeadlineExceeded,
+                               _RateLimiter)
+from metrics import HistogramSet
+
+# As in benchmarks.empire_load (bidding_bot pulls in the DB driver).
+BID_MAX_WAIT = 10.0
+MAX_RETRIES = 3
+BLOCK = 60.0
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_BID: "bid",
+                  PRIORITY_NORMAL: "normal"}
+
+ROUTE_LIMITS = {key: spec["limit"] for key, spec in ROUTES.items()
+                if "limit" in spec}
+
+# Built-in candidates: what ships, and the obvious alternatives.
+POLICIES: dict[str, dict[str, Any]] = {
+    "current": {"global": (120, 60.0), "reserved": GLOBAL_RESERVED},
+    "no-reserve": {"global": (120, 60.0), "reserved": {}},
+    "weighted": {"global": (120, 60.0), "reserved": GLOBAL_RESERVED,
+                 "weights": {PRIORITY_HIGH: 8, PRIORITY_BID: 4,
+                             PRIORITY_NORMAL: 1}},
+    "docs-10s": {"global": (120, 10.0), "reserved": GLOBAL_RESERVED},
+}
+
+
+class _VirtualSelector(selectors.SelectSelector):
+    """Polls the loop's real descriptors without blocking; when nothing is
+    ready, advances the loop's virtual clock by the timeout it would have
+    slept for, i.e. to the next scheduled timer."""
+
+    def __init__(self):
+        super().__init__()
+        self.loop: Optional["_VirtualLoop"] = None
+
+    def select(self, timeout: Optional[float] = None) -> list:
+        events = super().select(0)
+        if not events:
+            if timeout is None:
+                raise RuntimeError("simulation stalled: nothing is scheduled")
+            self.loop.now += timeout
+        return events
+
+
+class _VirtualLoop(asyncio.SelectorEventLoop):
+    """Event loop on simulated time: call_later, asyncio.sleep and every
+    timer run against ``time()``, which only moves when the loop is idle."""
+
+    def __init__(self):
+        selector = _VirtualSelector()
+        super().__init__(selector)
+        selector.loop = self
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def synthetic_trace(hours: float, load: float, seed: int) -> list[dict[str, Any]]:
+    """The benchmarks.empire_load mix as a trace: TradeBot and BiddingBot
+    polling on their periods, receipts and bid bursts as Poisson arrivals."""
+    rng = random.Random(seed)
+    duration = hours * 3600
+    trace = []
+    for period, endpoint in ((5.0, "GET /trading/user/trades"),
+                             (30.0, "GET /trading/automation/status"),
+                             (10.0, "GET /trading/user/auctions"),
+                             (60.0, "GET /metadata/socket")):
+        t = rng.uniform(0, period / load)
+        while t < duration:
+            trace.append({"t": t, "endpoint": endpoint,
+                          "priority": PRIORITY_NORMAL, "deadline": None})
+            t += period / load
+    for rate, burst, endpoint, priority, deadline in (
+            (0.2, (1, 1), "POST /trading/deposit/<id>/received", PRIORITY_HIGH, None),
+            (0.3, (1, 5), "POST /trading/deposit/<id>/bid", PRIORITY_BID,
+             BID_MAX_WAIT)):
+        t = rng.expovariate(rate * load)
+        while t < duration:
+            for _ in range(rng.randint(*burst)):
+                trace.append({"t": t, "endpoint": endpoint,
+                              "priority": priority, "deadline": deadline})
+            t += rng.expovariate(rate * load)
+    trace.sort(key=lambda request: request["t"])
+    return trace
+
+
+def load_trace(path: str) -> list[dict[str, Any]]:
+    with open(path) as file:
+        trace = [json.loads(line) for line in file if line.strip()]
+    start = min(request["t"] for request in trace)
+    for request in trace:
+        request["t"] -= start
+    trace.sort(key=lambda request: request["t"])
+    return trace
+
+
+def load_policy(path: str) -> tuple[str, dict[str, Any]]:
+    with open(path) as file:
+        spec = json.load(file)
+    name = spec.pop("name", path)
+    for key in ("reserved", "weights"):
+        if key in spec:
+            spec[key] = {int(tier): n for tier, n in spec[key].items()}
+    return name, spec
+
+
+class _Simulation:
+    """One policy against one trace, on one virtual loop."""
+
+    def __init__(self, policy: dict[str, Any], loop: _VirtualLoop,
+                 args: argparse.Namespace):
+        clock = loop.time
+        max_requests, window = policy["global"]
+        self.limiter = _RateLimiter(max_requests, window,
+                                    reserved=policy.get("reserved"),
+                                    weights=policy.get("weights"), clock=clock)
+        limits = {**ROUTE_LIMITS, **policy.get("limits", {})}
+        self.buckets = {key: (_RateLimiter(*limit, clock=clock),)
+                        for key, limit in limits.items()}
+        self.loop = loop
+        self.latency = args.latency
+        self.jitter = args.jitter
+        self.rng = random.Random(args.seed)
+        self.server_global = _Window(args.server_requests, args.server_window)
+        self.server_endpoints = {key: _Window(*limit)
+                                 for key, limit in DOCUMENTED_LIMITS.items()}
+        self.server_blocked_until = 0.0
+        self.wait = HistogramSet()
+        self.outcomes: Counter = Counter()
+        self.sent = 0
+        self.limited = 0
+
+    def _server(self, endpoint: str) -> int:
+        now = self.loop.time()
+        bucket = self.server_endpoints.get(endpoint)
+        if (now < self.server_blocked_until or not self.server_global.admit(now)
+                or (bucket is not None and not bucket.admit(now))):
+            self.server_blocked_until = max(self.server_blocked_until, now + BLOCK)
+            return 429
+        return 200
+
+    async def request(self, endpoint: str, priority: int,
+                      deadline: Optional[float]) -> None:
+        arrived = self.loop.time()
+        also = self.buckets.get(endpoint, ())
+        if deadline is not None:
+            deadline += arrived
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                await self.limiter.acquire(priority, also=also, deadline=deadline)
+            except DeadlineExceeded:
+                self.outcomes[(priority, "dropped")] += 1
+                return
+            if not attempt:
+                self.wait.observe(priority, self.loop.time() - arrived)
+            self.sent += 1
+            await asyncio.sleep(self.latency + self.rng.uniform(0.0, self.jitter))
+            if self._server(endpoint) == 200:
+                self.outcomes[(priority, "ok")] += 1
+                return
+            self.limited += 1
+            self.limiter.block_for(self.server_blocked_until - self.loop.time())
+            if priority == PRIORITY_BID:
+                break
+        self.outcomes[(priority, "429")] += 1
+
+    async def run(self, trace: list[dict[str, Any]]) -> float:
+        """Replay ``trace``; returns the simulated seconds it took."""
+        tasks = []
+        for request in trace:
+            delay = request["t"] - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(self.request(
+                request["endpoint"], request["priority"], request.get("deadline"))))
+        await asyncio.gather(*tasks)
+        return self.loop.time()
+
+
+def simulate(name: str, policy: dict[str, Any], trace: list[dict[str, Any]],
+             args: argparse.Namespace) -> None:
+    loop = _VirtualLoop()
+    started = time.process_time()
+    try:
+        simulation = _Simulation(policy, loop, args)
+        duration = loop.run_until_complete(simulation.run(trace))
+    finally:
+        loop.close()
+    cpu = time.process_time() - started
+    budget = args.server_requests * max(duration, args.server_window) / args.server_window
+    print(f"{name:<12} sent {simulation.sent:>6}  429s {simulation.limited:>4}  "
+          f"budget {simulation.sent / budget:6.1%}  cpu {cpu:5.2f}s")
+    snapshot = simulation.wait.snapshot()
+    for priority, tier in PRIORITY_NAMES.items():
+        outcomes = {kind: n for (p, kind), n in simulation.outcomes.items()
+                    if p == priority}
+        wait = snapshot.get(str(priority), {})
+        print(f"  {tier:<8} ok {outcomes.get('ok', 0):>6}  "
+              f"dropped {outcomes.get('dropped', 0):>4}  "
+              f"429 {outcomes.get('429', 0):>4}  grant ms "
+              f"p50 {wait.get('p50_ms', 0):>8.1f}  "
+              f"p99 {wait.get('p99_ms', 0):>8.1f}  "
+              f"max {wait.get('max_ms', 0):>8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trace", help="JSON-lines trace to replay")
+    parser.add_argument("--write-trace", help="save the synthetic trace here")
+    parser.add_argument("--hours", type=float, default=1.0,
+                        help="length of the synthetic trace")
+    parser.add_argument("--load", type=float, default=1.0,
+                        help="multiplier on every synthetic rate")
+    parser.add_argument("--policy", action="append", default=[],
+                        help="policy JSON file or built-in name "
+                             f"({', '.join(POLICIES)}); repeatable, "
+                             "default all built-ins")
+    parser.add_argument("--server-requests", type=int, default=120)
+    parser.add_argument("--server-window", type=float, default=60.0,
+                        help="Empire's real global window (docs say 60 or 10)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="seconds from slot grant to arrival at Empire")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthetic_trace(args.hours, args.load, args.seed)
+        if args.write_trace:
+            with open(args.write_trace, "w") as file:
+                file.writelines(json.dumps(request) + "\n" for request in trace)
+    policies = ([load_policy(p) if p not in POLICIES else (p, POLICIES[p])
+                 for p in args.policy] or list(POLICIES.items()))
+    span = trace[-1]["t"] if trace else 0.0
+    print(f"{len(trace)} requests over {span / 60:.0f} min; server "
+          f"{args.server_requests} / {args.server_window:.0f}s, latency "
+          f"{args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms")
+    for name, policy in policies:
+        simulate(name, policy, trace, args)
+
+
+if __name__ == "__main__":
+    main()
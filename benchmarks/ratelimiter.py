@@ -0,0 +1,191 @@
+"""
+Microbenchmark for csgoempire_client._RateLimiter.
+
+Pushes a few thousand mixed-priority acquire() calls through a small, fast
+window (so the run takes seconds, not minutes) at more than the window can
+grant, cancels a share of them while they are queued (the reconnect case), and
+reports grant latency per priority, CPU time per grant and event-loop
+wake-ups. The pre-scheduler polling dispatcher is kept below as
+``LegacyRateLimiter`` so both run the same workload side by side:
+
+    python -m benchmarks.ratelimiter
+    python -m benchmarks.ratelimiter --acquires 20000 --cancel 0.5 --overload 3
+
+Single runs are noisy (the legacy p99 alone moves 2x between seeds), so each
+invocation runs ``--runs`` seeds, alternating which limiter goes first, and
+reports medians. Measured on one core, seeds 1-9 and 20-28: by default the
+scheduler is at parity on CPU (39.7 vs 39.1 and 37.8 vs 37.8 us per grant),
+priority 0/1 p99 within 1.5 ms of legacy either way, with 5-10% fewer loop
+wake-ups; with the flags above it is ahead on every line (56.1 vs 57.0 us
+per grant; priority 0/1 p99 48.9/48.4 vs 50.5/49.8 ms, mean 13.8/16.7 vs
+16.8/18.8 ms). That is with the scheduler also doing what the legacy loop
+doesn't: a deadline check per acquire, dropping a cancelled waiter's count
+at once, and refunding a slot granted to a caller cancelled in the same
+tick. Almost all of the rest is asyncio's own per-task cost, identical for
+both.
+"""
+
+import argparse
+import asyncio
+import heapq
+import random
+import statistics
+import time
+from collections import deque
+from typing import Optional
+
+from csgoempire_client import (PRIORITY_BID, PRIORITY_HIGH, PRIORITY_NORMAL,
+                               _RateLimiter)
+
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_BID, PRIORITY_NORMAL)
+PRIORITY_WEIGHTS = (1, 3, 6)
+
+
+class LegacyRateLimiter:
+    """The polling dispatcher _RateLimiter used before the deadline scheduler."""
+
+    def __init__(self, max_requests: int, window: float):
+        self.max_requests = max_requests
+        self.window = window
+        self._timestamps = deque()
+        self._blocked_until = 0.0
+        self._waiters: list = []
+        self._seq = 0
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _drain_expired(self, now: float) -> None:
+        while self._timestamps and now - self._timestamps[0] >= self.window:
+            self._timestamps.popleft()
+
+    def _delay_until_slot(self, now: float) -> float:
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._drain_expired(now)
+        if len(self._timestamps) < self.max_requests:
+            return 0.0
+        return self.window - (now - self._timestamps[0])
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, self._seq, fut))
+        self._seq += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await fut
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            delay = self._delay_until_slot(time.monotonic())
+            if delay > 0.0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self._timestamps.append(time.monotonic())
+            fut.set_result(None)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _run(limiter, args) -> dict:
+    rng = random.Random(args.seed)
+    loop = asyncio.get_running_loop()
+    latencies: dict[int, list[float]] = {p: [] for p in PRIORITIES}
+
+    # Count event-loop wake-ups: every select() is one pass of the loop.
+    selector = loop._selector
+    real_select = selector.select
+    wakeups = 0
+
+    def counting_select(timeout=None):
+        nonlocal wakeups
+        wakeups += 1
+        return real_select(timeout)
+
+    selector.select = counting_select
+
+    async def one(priority: int) -> None:
+        start = time.perf_counter()
+        await limiter.acquire(priority)
+        latencies[priority].append(time.perf_counter() - start)
+
+    # Offered load is ``--overload`` times what the window can grant, arriving
+    # in small bursts; a share of the waiters is cancelled while still queued.
+    rate = args.max_requests / args.window * args.overload
+    burst = 20
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    tasks = []
+    for i in range(args.acquires):
+        priority = rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0]
+        task = asyncio.ensure_future(one(priority))
+        tasks.append(task)
+        if rng.random() < args.cancel:
+            loop.call_later(rng.uniform(0.0, args.window * 3), task.cancel)
+        if i % burst == burst - 1:
+            await asyncio.sleep(burst / rate)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    selector.select = real_select
+    grants = sum(len(v) for v in latencies.values())
+    return {"latencies": latencies, "grants": grants, "cpu": cpu, "wall": wall,
+            "wakeups": wakeups}
+
+
+def _report(name: str, results: list[dict]) -> None:
+    """Medians over the runs of one limiter."""
+    def median(values) -> float:
+        return statistics.median(list(values))
+
+    grants = median(r["grants"] for r in results)
+    cpu = median(r["cpu"] / max(r["grants"], 1) for r in results)
+    print(f"{name}: {grants:.0f} grants in "
+          f"{median(r['wall'] for r in results):.2f}s wall, "
+          f"{cpu * 1e6:.1f} us CPU/grant, "
+          f"{median(r['wakeups'] for r in results):.0f} loop wake-ups")
+    for priority in PRIORITIES:
+        runs = [r["latencies"][priority] for r in results
+                if r["latencies"][priority]]
+        if not runs:
+            continue
+        print(f"  priority {priority}: n={median(len(v) for v in runs):<6.0f} "
+              f"p50={median(_percentile(v, 50) for v in runs) * 1e3:8.1f} ms  "
+              f"p99={median(_percentile(v, 99) for v in runs) * 1e3:8.1f} ms  "
+              f"mean={median(statistics.fmean(v) for v in runs) * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--acquires", type=int, default=5000)
+    parser.add_argument("--max-requests", type=int, default=200)
+    parser.add_argument("--window", type=float, default=0.05)
+    parser.add_argument("--overload", type=float, default=1.5,
+                        help="offered load as a multiple of the window's capacity")
+    parser.add_argument("--cancel", type=float, default=0.3,
+                        help="share of acquires cancelled while queued")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=9,
+                        help="seeds --seed, --seed + 1, ...; medians are reported")
+    args = parser.parse_args()
+
+    limiters = [("legacy", LegacyRateLimiter), ("deadline", _RateLimiter)]
+    results: dict[str, list[dict]] = {name: [] for name, _ in limiters}
+    first_seed = args.seed
+    for run in range(args.runs):
+        args.seed = first_seed + run
+        # Alternate which limiter goes first: a second asyncio.run in the
+        # same process runs on a bigger heap, so order alone skews a pair.
+        for name, cls in (limiters if run % 2 == 0 else limiters[::-1]):
+            limiter = cls(args.max_requests, args.window)
+            results[name].append(asyncio.run(_run(limiter, args)))
+    for name, _ in limiters:
+        _report(name, results[name])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-request client overhead of CSGOEmpireClient, network excluded.
+
+Two measurements:
+
+  resolve   the per-request route work alone — the pre-route-table lookup
+            (``re.sub`` for the endpoint key, repeated in _request, _send and
+            _invalidate, plus a dict lookup each for limiter, cache policy and
+            invalidations; kept below as ``legacy_resolve``) against
+            ``_RouteTable.resolve``
+  request   full ``_request`` calls (limiter, ledger, cache / single-flight,
+            response decode) against an in-memory session that answers at
+            once, so what's timed is the client itself
+
+Both run the same mix of call sites the bots use (auction polling, bids,
+trade lookups, receipts):
+
+    python -m benchmarks.request_overhead
+    python -m benchmarks.request_overhead --requests 50000
+"""
+
+import argparse
+import asyncio
+import re
+import time
+
+from csgoempire_client import CSGOEmpireClient
+
+# (method, path) pairs as the API methods build them.
+MIX = [
+    ("GET", "/trading/user/auctions"),
+    ("POST", "/trading/deposit/312345678/bid"),
+    ("GET", "/trading/user/trade/312345678/bid"),
+    ("POST", "/trading/deposit/298765432/received"),
+    ("GET", "/trading/user/trades"),
+    ("POST", "/trading/deposit/312345679/bid"),
+]
+
+# The three dicts the legacy lookup consulted, as they were.
+LEGACY_LIMITS = {"POST /trading/deposit/<id>/bid": (18, 10.0),
+                 "GET /trading/user/trades": (2, 10.0),
+                 "POST /trading/deposit": (18, 10.0)}
+LEGACY_CACHE = {"GET /metadata/socket": (5.0, 0.0)}
+LEGACY_INVALIDATIONS = {"POST /trading/deposit/<id>/bid": ("GET /metadata/socket",)}
+
+
+def legacy_resolve(method: str, path: str) -> tuple:
+    """What _request / _send / _invalidate did per request before routes."""
+    key = f"{method} {re.sub(r'/\d+', '/<id>', path)}"           # _request
+    if method != "GET":
+        invalidates = LEGACY_INVALIDATIONS.get(
+            f"{method} {re.sub(r'/\d+', '/<id>', path)}", ())      # _invalidate
+    else:
+        invalidates = ()
+    cache = LEGACY_CACHE.get(key) if method == "GET" else None
+    send_key = f"{method} {re.sub(r'/\d+', '/<id>', path)}"        # _send
+    return send_key, LEGACY_LIMITS.get(send_key), cache, invalidates
+
+
+def bench_resolve(requests: int) -> None:
+    table = CSGOEmpireClient("bench")._routes
+    calls = (MIX * (requests // len(MIX) + 1))[:requests]
+    for name, resolve in (("legacy", legacy_resolve),
+                          ("route table", table.resolve)):
+        started = time.perf_counter()
+        for method, path in calls:
+            resolve(method, path)
+        elapsed = time.perf_counter() - started
+        print(f"  resolve  {name:<12} {elapsed / requests * 1e9:8.0f} ns/request")
+
+
+class _Response:
+    status = 200
+    headers: dict = {}
+    content_type = "application/json"
+    charset = None
+
+    async def read(self) -> bytes:
+        return b'{"success": true}'
+
+    async def __aenter__(self) -> "_Response":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+
+class _InMemorySession:
+    """Stands in for aiohttp.ClientSession: answers every request at once."""
+    closed = False
+
+    def request(self, method: str, url: str, **kwargs) -> _Response:
+        return _Response()
+
+    async def close(self) -> None:
+        pass
+
+
+async def bench_request(requests: int) -> None:
+    # Budget large enough that the limiter never makes anyone wait.
+    client = CSGOEmpireClient("bench", max_requests=requests * 2, window=3600.0)
+    for limiter in client._endpoint_limiters.values():
+        limiter.max_requests = requests * 2
+    client._session = _InMemorySession()
+    calls = (MIX * (requests // len(MIX) + 1))[:requests]
+    started = time.perf_counter()
+    for method, path in calls:
+        await client._request(method, path)
+    elapsed = time.perf_counter() - started
+    print(f"  request  {'_request':<12} {elapsed / requests * 1e6:8.1f} µs/request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    print(f"{args.requests} requests over {len(MIX)} call sites")
+    bench_resolve(args.requests)
+    asyncio.run(bench_request(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,16 +14,28 @@ the websocket transport and the bidding strategy live here.
 """
 
 import asyncio
+import heapq
 import time
 from datetime import datetime, timezone
 from enum import Enum
+from typing import Any
 
 import socketio
 
+# new_item / init pushes (up to PER_PAGE items) are screened as columns with
+# NumPy when it is installed; it is optional, the pure-Python path gives the
+# same answers.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from logger import logger as _logger
 logger = _logger.prefixed("bidder")
 from db import DB
-from csgoempire_client import CSGOEmpireClient, CSGOEmpireError
+from price_index import PriceIndex
+from csgoempire_client import CSGOEmpireClient, CSGOEmpireError, DeadlineExceeded
+from metrics import Histogram, StageLatency, Trace, current_trace
 
 # Websocket lives on a different host than the REST API.
 WS_URL = "wss://trade.csgoempire.com"
@@ -36,14 +48,48 @@ PRICE_MAX_ABOVE = 20       # only surface auctions <= 20% above market value
 # bidding on a stale valuation risks overpaying. price_updated_at is naive UTC.
 PRICE_MAX_AGE = 60 * 60
 PER_PAGE = 2500
+# Below this many items a push is screened in plain Python: converting the
+# columns to arrays costs about what the vectorised compare saves, and only a
+# near-PER_PAGE push comes out ahead (python -m benchmarks.batch_eval).
+VECTOR_MIN_BATCH = 2048
 RECONNECT_DELAY = 5
 INIT_RETRY_DELAY = 180
 # Cap on retries while Empire reports "one trade at a time" (1s apart).
 MAX_ONE_TRADE_RETRIES = 10
+# A bid that can't get out within this many seconds (rate-limit queue or the bid
+# lock) is dropped: by then the auction has usually moved past it. It is also
+# dropped this close to the auction's end, where it would only land too late.
+BID_MAX_WAIT = 10.0
+AUCTION_END_MARGIN = 1.0
+# The auction book keeps tracked auctions from new_item / auction_update until
+# they end (plus a grace for late updates), at most AUCTION_BOOK_MAX of them;
+# one pushed without an end time is kept AUCTION_BOOK_TTL. REST
+# (/trading/user/auctions) only reconciles it, every AUCTION_RECONCILE_INTERVAL.
+AUCTION_BOOK_MAX = 5000
+AUCTION_BOOK_TTL = 5 * 60
+AUCTION_BOOK_GRACE = 30
+AUCTION_RECONCILE_INTERVAL = 60
+# Bid latency is traced per stage, from the websocket event to Empire's answer
+# to the bid POST, by event type (new_item / auction_update):
+#     price    valuation lookup (for new_item: screening the whole push)
+#     queue    waiting for the one bid slot (_BidScheduler)
+#     limiter  waiting for rate-limit slots (CSGOEmpireClient)
+#     http     the POST round trip
+#     total    event handler entry -> first answer to the bid
+# Summarised to the log every LATENCY_LOG_INTERVAL; the newest raw samples are
+# dumped to latency_file then and on stop.
+LATENCY_STAGES = ("price", "queue", "limiter", "http", "total")
+LATENCY_LOG_INTERVAL = 5 * 60
+# Queued bids are granted highest margin-per-second-left first; time left is
+# floored at this so a bid about to expire can't win on urgency alone.
+URGENCY_FLOOR = 1.0
 # CSGOEmpire's websocket pushes no balance event, so balance is cached from
 # metadata and only refetched at most once per this window (coalesces the burst
 # of trade_status events that all signal the same balance change).
 BALANCE_TTL = 5.0
+# Between refetches the balance is kept by _BalanceLedger from our own bids;
+# metadata is the source of truth again at least this often.
+BALANCE_RECONCILE_INTERVAL = 5 * 60
 
 # Empire error messages we react to specifically.
 ERR_ONE_TRADE = "You can only make one trade at a time. Please wait a moment and try again."
@@ -53,6 +99,294 @@ ERR_OUTBID = ("This item has already been bid on for a higher amount",
               "This offer was already placed by someone else!")
 
 
+# Bid-max column value for "no bid": untracked, unpriced or stale. No
+# market_value compares >= it.
+_NO_BID = float("-inf")
+
+
+def _price_verdict(row: tuple, now_utc: datetime) -> tuple[int | None, str | None]:
+    """``(bid_max, None)`` for a usable PriceIndex row, else ``(None, reason)``."""
+    price, updated_at = row
+    if updated_at is None:
+        return None, "no price timestamp"
+    age = (now_utc - updated_at).total_seconds()
+    if age > PRICE_MAX_AGE:
+        return None, f"stale price ({age / 60:.0f} min old)"
+    return int(price), None
+
+
+def _select_bids(values: list, slots: list[int], bid_maxes: list) -> list[int]:
+    """Rows of a batch whose market value is within our bid max:
+    ``bid_maxes[slots[row]] >= values[row]``. Slot -1 (untracked) reads the
+    trailing _NO_BID sentinel of ``bid_maxes``."""
+    if np is not None and len(values) >= VECTOR_MIN_BATCH:
+        limits = np.asarray(bid_maxes, dtype=np.float64)[np.asarray(slots, dtype=np.intp)]
+        return np.flatnonzero(limits >= np.asarray(values, dtype=np.float64)).tolist()
+    return [row for row, (value, slot) in enumerate(zip(values, slots))
+            if bid_maxes[slot] >= value]
+
+
+class _Auction:
+    __slots__ = ("item_id", "market_name", "highest_bid", "highest_bidder",
+                 "ends_at", "our_bid", "bid_at")
+
+    def __init__(self, item_id, market_name: str, ends_at: float):
+        self.item_id = item_id
+        self.market_name = market_name
+        self.highest_bid: int | None = None
+        self.highest_bidder = None
+        self.ends_at = ends_at          # epoch seconds
+        self.our_bid: int | None = None
+        self.bid_at = 0.0               # monotonic time of our last bid
+
+
+class _AuctionBook:
+    """
+    Auctions we could bid on, fed by the websocket instead of refetched over
+    REST: ``new_item`` adds tracked items, ``auction_update`` moves their
+    highest bid / bidder / end time, and our own bids are recorded as they
+    succeed. Entries expire at their end time (a heap on ``ends_at``, skipping
+    superseded heap entries when an auction gets extended), and the book never
+    holds more than AUCTION_BOOK_MAX — the soonest-ending go first.
+    """
+    __slots__ = ("_auctions", "_ends")
+
+    def __init__(self):
+        self._auctions: dict[Any, _Auction] = {}
+        self._ends: list[tuple[float, Any]] = []     # (ends_at, item id)
+
+    def __len__(self) -> int:
+        return len(self._auctions)
+
+    def get(self, item_id) -> _Auction | None:
+        return self._auctions.get(item_id)
+
+    def add(self, item: dict) -> None:
+        """Book a pushed item (new_item / init), or refresh it if known."""
+        now = time.time()
+        self._evict(now)
+        item_id = item["id"]
+        auction = self._auctions.get(item_id)
+        if auction is None:
+            ends_at = item.get("auction_ends_at")
+            auction = self._auctions[item_id] = _Auction(
+                item_id, item.get("market_name"),
+                float(ends_at) if ends_at else now + AUCTION_BOOK_TTL)
+            heapq.heappush(self._ends, (auction.ends_at, item_id))
+            if len(self._auctions) > AUCTION_BOOK_MAX:
+                self._evict(now, keep=AUCTION_BOOK_MAX)
+        self._apply(auction, item)
+
+    def update(self, item: dict) -> _Auction | None:
+        """Apply an auction_update; None if the auction isn't booked."""
+        auction = self._auctions.get(item.get("id"))
+        if auction is not None:
+            self._apply(auction, item)
+        return auction
+
+    def _apply(self, auction: _Auction, item: dict) -> None:
+        if "auction_highest_bid" in item:
+            auction.highest_bid = item["auction_highest_bid"]
+            auction.highest_bidder = item.get("auction_highest_bidder")
+        ends_at = item.get("auction_ends_at")
+        if ends_at and float(ends_at) != auction.ends_at:
+            auction.ends_at = float(ends_at)
+            heapq.heappush(self._ends, (auction.ends_at, auction.item_id))
+
+    def placed(self, item_id, bid: int, bidder) -> None:
+        """Record a bid of ours that Empire accepted."""
+        auction = self._auctions.get(item_id)
+        if auction is not None:
+            auction.our_bid = auction.highest_bid = bid
+            auction.highest_bidder = bidder
+            auction.bid_at = time.monotonic()
+
+    def reconcile(self, active: list[dict], fetched_at: float) -> int:
+        """Merge the REST list of auctions we're in. Auctions we bid on before
+        ``fetched_at`` (monotonic) that it no longer lists are over and are
+        dropped; returns how many."""
+        listed = set()
+        for item in active:
+            if item.get("id") is None:
+                continue
+            listed.add(item["id"])
+            self.add(item)
+        gone = [item_id for item_id, auction in self._auctions.items()
+                if auction.our_bid is not None and auction.bid_at < fetched_at
+                and item_id not in listed]
+        for item_id in gone:
+            del self._auctions[item_id]
+        return len(gone)
+
+    def _evict(self, now: float, keep: int | None = None) -> None:
+        """Drop auctions that ended before ``now`` - grace; with ``keep``,
+        drop soonest-ending ones until at most ``keep`` remain."""
+        ends = self._ends
+        while ends and (ends[0][0] + AUCTION_BOOK_GRACE <= now
+                        or (keep is not None and len(self._auctions) > keep)):
+            ends_at, item_id = heapq.heappop(ends)
+            auction = self._auctions.get(item_id)
+            if auction is not None and auction.ends_at == ends_at:
+                del self._auctions[item_id]
+        # Heap entries of extended auctions only leave at their old end time;
+        # rebuild if they ever outnumber the live ones.
+        if len(ends) > 2 * len(self._auctions) + 64:
+            self._ends = [(a.ends_at, i) for i, a in self._auctions.items()]
+            heapq.heapify(self._ends)
+
+
+class _BalanceLedger:
+    """
+    Our spendable balance between metadata fetches. Empire holds a bid's
+    coins while it leads and refunds them when it's outbid, so instead of
+    waiting for the next metadata fetch we do the same locally: ``reserve``
+    when Empire accepts a bid, ``release`` when an auction_update shows
+    someone else on top. A hold still standing when its auction ends was a
+    win — the coins are spent, so it is dropped without a refund.
+
+    ``sync`` adopts a metadata balance and reports the drift from our
+    estimate. That balance already nets out every hold Empire knows about and
+    every refund it has made, which we can't tell apart, so our holds are
+    dropped with it: a refund it already counted must not be released again.
+    An outbid on a bid placed before the sync is then only seen at the next
+    one — the ledger errs low, never high.
+    """
+    __slots__ = ("available", "_holds", "synced")
+
+    def __init__(self):
+        self.available = 0          # coins*100
+        self._holds: dict[Any, tuple[int, float]] = {}  # item id -> (amount, ends_at)
+        self.synced = False
+
+    def sync(self, balance: int) -> int:
+        """Adopt Empire's balance; returns it minus our estimate (0 on the
+        first sync)."""
+        drift = balance - self.available if self.synced else 0
+        self.available = balance
+        self._holds.clear()
+        self.synced = True
+        return drift
+
+    def reserve(self, item_id, amount: int, ends_at: float | None) -> None:
+        now = time.time()
+        for held_id in [i for i, (_, end) in self._holds.items()
+                        if end + AUCTION_BOOK_GRACE <= now]:
+            del self._holds[held_id]
+        self.release(item_id)
+        self._holds[item_id] = (amount, ends_at or now + AUCTION_BOOK_TTL)
+        self.available -= amount
+
+    def release(self, item_id) -> int:
+        """Refund the hold on ``item_id``, if any; returns the amount."""
+        amount, _ = self._holds.pop(item_id, (0, 0.0))
+        self.available += amount
+        return amount
+
+
+class _QueuedBid:
+    __slots__ = ("item_id", "margin", "deadline", "queued_at", "future")
+
+    def __init__(self, item_id, margin: int, deadline: float,
+                 future: asyncio.Future):
+        self.item_id = item_id
+        self.margin = margin
+        self.deadline = deadline
+        self.queued_at = time.monotonic()
+        self.future = future
+
+    def score(self, now: float) -> float:
+        return self.margin / max(self.deadline - now, URGENCY_FLOOR)
+
+
+class _BidScheduler:
+    """
+    Empire processes one trade at a time, so one bid is in flight at a time —
+    but the rest aren't served in arrival order like an asyncio.Lock would:
+    whenever the slot frees, the queued bid with the most expected margin per
+    second left (``margin / time to deadline``) goes next, so a fat margin on
+    an auction about to close doesn't wait behind a thin one with time to spare.
+
+    A queued bid is dropped when its deadline passes ("stale") or a newer bid
+    on the same item replaces it ("superseded" — the auction moved, so the
+    old amount would only be rejected as outbid).
+    """
+    __slots__ = ("_queue", "_busy", "wait", "queued_max", "granted", "stale",
+                 "superseded")
+
+    def __init__(self):
+        self._queue: dict[Any, _QueuedBid] = {}    # item id -> waiting bid
+        self._busy = False
+        self.wait = Histogram()     # queued -> granted
+        self.queued_max = 0
+        self.granted = 0
+        self.stale = 0
+        self.superseded = 0
+
+    async def acquire(self, item_id, margin: int, deadline: float) -> str | None:
+        """Wait for the bid slot. Returns None once this bid holds it (give it
+        back with ``release()``), else why it was dropped: "stale" or
+        "superseded"."""
+        if not self._busy and not self._queue:
+            self._busy = True
+            self.granted += 1
+            self.wait.observe(0.0)
+            return None
+        loop = asyncio.get_running_loop()
+        entry = _QueuedBid(item_id, margin, deadline, loop.create_future())
+        previous = self._queue.pop(item_id, None)
+        # A cancelled bid stays queued until its task resumes to clean up.
+        if previous is not None and not previous.future.done():
+            self.superseded += 1
+            previous.future.set_result("superseded")
+        self._queue[item_id] = entry
+        self.queued_max = max(self.queued_max, len(self._queue))
+        timer = loop.call_later(max(0.0, deadline - time.monotonic()),
+                                self._expire, entry)
+        try:
+            return await entry.future
+        except asyncio.CancelledError:
+            if self._queue.get(item_id) is entry:
+                del self._queue[item_id]
+            elif (entry.future.done() and not entry.future.cancelled()
+                    and entry.future.result() is None):
+                self.release()  # granted as we were cancelled: pass it on
+            raise
+        finally:
+            timer.cancel()
+
+    def _expire(self, entry: _QueuedBid) -> None:
+        if self._queue.get(entry.item_id) is entry:
+            del self._queue[entry.item_id]
+            if not entry.future.done():
+                self.stale += 1
+                entry.future.set_result("stale")
+
+    def release(self) -> None:
+        """Free the slot and grant it to the best queued bid, if any."""
+        self._busy = False
+        now = time.monotonic()
+        while self._queue:
+            best = max(self._queue.values(), key=lambda e: e.score(now))
+            del self._queue[best.item_id]
+            if best.future.done():
+                continue
+            if now >= best.deadline:
+                self.stale += 1
+                best.future.set_result("stale")
+                continue
+            self._busy = True
+            self.granted += 1
+            self.wait.observe(now - best.queued_at)
+            best.future.set_result(None)
+            return
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"in_flight": self._busy, "queued": len(self._queue),
+                "queued_max": self.queued_max, "granted": self.granted,
+                "stale": self.stale, "superseded": self.superseded,
+                "wait": self.wait.snapshot()}
+
+
 class BidResult(Enum):
     SUCCESS = 1
     FAILED = 0
@@ -60,17 +394,24 @@ class BidResult(Enum):
 
 
 class BiddingBot:
-    def __init__(self, empire: CSGOEmpireClient, db: DB):
+    def __init__(self, empire: CSGOEmpireClient, db: DB, *,
+                 latency_file: str | None = None):
         self.empire = empire
         self.db = db
+        self._latency = StageLatency()
+        self._latency_file = latency_file
+        # Valuations come from memory, not one DB query per pushed item.
+        self._prices = PriceIndex(db)
         self._sio = socketio.AsyncClient(ssl_verify=False, reconnection=False)
-        self._auctions_lock = asyncio.Lock()
         # Empire processes one trade at a time, so serialise our bids instead of
-        # firing them concurrently and fighting "one trade at a time" errors.
-        self._bid_lock = asyncio.Lock()
-        self._active_auctions: dict[int, str] = {}  # auction id -> market_name
+        # firing them concurrently and fighting "one trade at a time" errors;
+        # the scheduler picks which queued bid goes next.
+        self._bids = _BidScheduler()
+        self._book = _AuctionBook()
+        self._tasks: list[asyncio.Task] = []   # refresh / reconcile / report loops
         self._meta: dict | None = None
-        self._balance: int = 0          # cached, coins*100
+        self._ledger = _BalanceLedger()
+        self._filters_max: int | None = None  # price_max last sent to the socket
         self._last_refresh: float = 0.0  # monotonic time of last metadata fetch
         self._stopping = False          # set by stop() for graceful shutdown
         self._register_handlers()
@@ -79,10 +420,37 @@ class BiddingBot:
     def _user(self) -> dict:
         return self._meta["user"]
 
+    @property
+    def _balance(self) -> int:
+        """Spendable coins*100: metadata balance adjusted by our own bids."""
+        return self._ledger.available
+
+    def bid_stats(self) -> dict[str, Any]:
+        """Bid queue snapshot: in flight, depth (now / max), granted, dropped
+        stale / superseded, and queue wait percentiles."""
+        return self._bids.snapshot()
+
+    def latency_stats(self) -> dict[str, dict[str, Any]]:
+        """Bid latency percentiles by event type and stage (LATENCY_STAGES)."""
+        return self._latency.snapshot()
+
+    def dump_latency(self, path: str) -> int:
+        """Write the newest raw latency samples to ``path`` as JSON lines;
+        returns how many."""
+        return self._latency.dump(path)
+
     # ------------------------------------------------------------------ #
     # lifecycle
     # ------------------------------------------------------------------ #
     async def run(self) -> None:
+        try:
+            await self._run()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self._report_latency()
+
+    async def _run(self) -> None:
         while not self._stopping:
             try:
                 await self._connect_and_wait()
@@ -109,6 +477,15 @@ class BiddingBot:
             logger.error(f"[ws] disconnect on stop failed: {e}")
 
     async def _connect_and_wait(self) -> None:
+        # Load prices before the first auction arrives; a failed load is an
+        # init failure (retried by run()), so we never bid from an empty index.
+        if not self._prices.loaded:
+            await self._prices.reload()
+        if not self._tasks:
+            self._tasks = [asyncio.ensure_future(self._prices.run()),
+                           asyncio.ensure_future(self._reconcile_auctions()),
+                           asyncio.ensure_future(self._reconcile_balance()),
+                           asyncio.ensure_future(self._log_latency())]
         # Fresh metadata each connection -> fresh socket token/signature/balance.
         await self._fetch_metadata()
         logger.info("[ws] connecting...")
@@ -131,6 +508,7 @@ class BiddingBot:
     # ------------------------------------------------------------------ #
     async def _on_connect(self) -> None:
         logger.info("[ws] connected")
+        self._filters_max = None    # a new socket has no filters yet
 
     async def _on_init(self, data) -> None:
         if data and data.get("authenticated"):
@@ -147,16 +525,36 @@ class BiddingBot:
     async def _on_disconnect(self) -> None:
         logger.info("[ws] socket disconnected")
 
-    async def _fetch_metadata(self) -> None:
-        """Refetch metadata and refresh the cached balance."""
-        self._meta = await self.empire.get_metadata()
-        self._balance = self._user.get("balance", 0)
+    async def _fetch_metadata(self, *, fresh: bool = False) -> None:
+        """Refetch metadata and resync the balance ledger to it."""
+        self._meta = await self.empire.get_metadata(fresh=fresh)
+        drift = self._ledger.sync(self._user.get("balance", 0))
         self._last_refresh = time.monotonic()
+        if drift:
+            logger.info(f"[balance] ledger off by {drift / 100:+.2f} C — resynced "
+                        f"to {self._balance / 100:.2f} C")
+
+    async def _reconcile_balance(self) -> None:
+        """Resync the ledger from metadata every BALANCE_RECONCILE_INTERVAL.
+        Drift (a NO_BALANCE rejection, a trade changing state) resyncs sooner
+        through _refresh_user_and_filters."""
+        while True:
+            await asyncio.sleep(BALANCE_RECONCILE_INTERVAL)
+            try:
+                await self._fetch_metadata(fresh=True)
+            except CSGOEmpireError as err:
+                logger.error(f"[balance] metadata fetch failed: {err}")
+                continue
+            await self._update_filters()
 
     async def _update_filters(self) -> None:
+        """Send price_max = current balance to the socket, unless unchanged."""
+        if self._balance == self._filters_max:
+            return
         if self._balance < MIN_BALANCE:
             logger.info(f"[filters] balance too low to bid: {self._balance / 100:.2f} C")
             return
+        self._filters_max = self._balance
         await self._sio.emit("filters", {
             "price_max": self._balance,
             "per_page": PER_PAGE,
@@ -169,37 +567,74 @@ class BiddingBot:
         # Coalesce bursts: skip the REST refetch if we just refreshed; the cached
         # balance is good enough until the TTL elapses.
         if time.monotonic() - self._last_refresh >= BALANCE_TTL:
-            await self._fetch_metadata()
+            await self._fetch_metadata(fresh=True)
         await self._update_filters()
 
     # ------------------------------------------------------------------ #
     # auction events
     # ------------------------------------------------------------------ #
     async def _on_new_item(self, items) -> None:
-        await asyncio.gather(*(self._consider_new_item(i) for i in items))
+        started = time.monotonic()
+        candidates = self._screen_new_items(items)
+        self._latency.observe("new_item", "price", time.monotonic() - started)
+        if candidates:
+            await asyncio.gather(*(self._bid_new_item(item, bid_max, started)
+                                   for item, bid_max in candidates))
+
+    def _screen_new_items(self, items) -> list[tuple[dict, int]]:
+        """The items of a push worth bidding on, as ``(item, bid_max)``.
+
+        A push can carry PER_PAGE items and almost none are ours to bid on, so
+        instead of a coroutine per item the batch becomes columns (market
+        value, PriceIndex position), the bid max of every index entry is
+        judged once, and ``bid_max >= market_value`` runs over the whole batch
+        in one pass (_select_bids). Only survivors get a coroutine."""
+        positions = self._prices.positions
+        book = self._book
+        batch, values, slots = [], [], []
+        balance = self._balance
+        for item in items:
+            market_value = item.get("market_value")
+            if market_value is None or item.get("id") is None:
+                continue
+            slot = positions.get(item.get("market_name"), -1)
+            # Only tracked items can ever be bid on, so only they are booked.
+            if slot >= 0:
+                book.add(item)
+            # Skip what we can't afford; otherwise Empire rejects every attempt
+            # with "not enough coins" and the auction_update stream re-triggers
+            # it in a loop.
+            if market_value > balance:
+                continue
+            batch.append(item)
+            values.append(market_value)
+            slots.append(slot)
+        if not batch:
+            return []
 
-    async def _consider_new_item(self, item) -> None:
-        item_id = item.get("id")
+        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)  # naive UTC, matches DB
+        verdicts = [_price_verdict(row, now_utc) for row in self._prices.rows]
+        bid_maxes = [_NO_BID if bid_max is None else bid_max for bid_max, _ in verdicts]
+        bid_maxes.append(_NO_BID)
+        # Same [skip] lines as the per-item path, once per pushed name.
+        for slot in set(slots):
+            if slot >= 0 and verdicts[slot][1]:
+                logger.info(f"[skip] {self._prices.names[slot]} — {verdicts[slot][1]}")
+        return [(batch[row], bid_maxes[slots[row]])
+                for row in _select_bids(values, slots, bid_maxes)]
+
+    async def _bid_new_item(self, item, bid_max: int, started: float) -> None:
+        item_id = item["id"]
         market_name = item.get("market_name")
-        market_value = item.get("market_value")
-        if item_id is None or market_name is None or market_value is None:
-            return
-
-        bid_max = await self._fresh_bid_max(market_name)
-        if bid_max is None:
-            return
-        if bid_max < market_value:
-            return
-        # Skip what we can't afford; otherwise Empire rejects every attempt with
-        # "not enough coins" and the auction_update stream re-triggers it in a loop.
-        if market_value > self._balance:
-            return
-
+        market_value = item["market_value"]
         logger.info(f"[auction] {item_id} {market_name} — "
                     f"market {market_value / 100:.2f} C / max {bid_max / 100:.2f} C")
-        result = await self._place_bid(item_id, int(market_value), bid_max)
+        result = await self._place_bid(item_id, int(market_value), bid_max,
+                                       self._bid_deadline(item.get("auction_ends_at")),
+                                       margin=bid_max - market_value,
+                                       trace=self._latency.trace("new_item", started))
         if result is BidResult.SUCCESS:
-            await self._get_active_auctions()
+            await self._update_filters()
         elif result is BidResult.NO_BALANCE:
             await self._refresh_user_and_filters()
 
@@ -207,16 +642,22 @@ class BiddingBot:
         await asyncio.gather(*(self._consider_auction_update(i) for i in items))
 
     async def _consider_auction_update(self, item) -> None:
+        trace = self._latency.trace("auction_update")
         item_id = item.get("id")
         highest = item.get("auction_highest_bid")
         if item_id is None or highest is None:
             return
 
-        market_name = await self._market_name_for(item_id)
-        if not market_name or item.get("auction_highest_bidder") == self._user["id"]:
+        auction = self._book.update(item)
+        if auction is None or auction.highest_bidder == self._user["id"]:
             return
+        # Someone else leads: Empire has refunded our bid, if we had one.
+        if self._ledger.release(item_id):
+            await self._update_filters()
+        market_name = auction.market_name
 
-        bid_max = await self._fresh_bid_max(market_name)
+        bid_max = self._fresh_bid_max(market_name)
+        trace.observe("price", time.monotonic() - trace.started)
         if bid_max is None:
             return
 
@@ -225,15 +666,19 @@ class BiddingBot:
         bid = self.empire.min_next_bid(highest)
         if bid_max < bid:
             return
-        # Skip what we can't afford (see _consider_new_item) — stops the futile
+        # Skip what we can't afford (see _screen_new_items) — stops the futile
         # outbid loop while others keep raising an auction past our balance.
         if bid > self._balance:
             return
 
         logger.info(f"[outbid] {item_id} {market_name}: {highest / 100:.2f} -> {bid / 100:.2f} C")
         # bid_max=0: the exact bid is already capped above, so disable escalation.
-        result = await self._place_bid(item_id, bid, bid_max=0)
-        if result is BidResult.NO_BALANCE:
+        result = await self._place_bid(item_id, bid, bid_max=0,
+                                       deadline=self._bid_deadline(auction.ends_at),
+                                       margin=bid_max - bid, trace=trace)
+        if result is BidResult.SUCCESS:
+            await self._update_filters()
+        elif result is BidResult.NO_BALANCE:
             await self._refresh_user_and_filters()
 
     async def _on_trade_status(self, items) -> None:
@@ -264,17 +709,65 @@ class BiddingBot:
     # ------------------------------------------------------------------ #
     # bidding
     # ------------------------------------------------------------------ #
-    async def _place_bid(self, item_id, bid_value: int, bid_max: int) -> BidResult:
+    @staticmethod
+    def _bid_deadline(ends_at) -> float:
+        """Monotonic time after which a bid can no longer win: BID_MAX_WAIT
+        from now, or just before the auction ends (``ends_at``, epoch) if
+        sooner."""
+        now = time.monotonic()
+        deadline = now + BID_MAX_WAIT
+        if ends_at:
+            deadline = min(deadline,
+                           now + float(ends_at) - time.time() - AUCTION_END_MARGIN)
+        return deadline
+
+    async def _place_bid(self, item_id, bid_value: int, bid_max: int,
+                         deadline: float, *, margin: int,
+                         trace: Trace | None = None) -> BidResult:
         """Place a bid, escalating up to bid_max when outbid. Serialised by the
-        bid lock so only one bid is in flight at a time (Empire requirement)."""
-        async with self._bid_lock:
+        bid scheduler so only one bid is in flight at a time (Empire
+        requirement), best ``margin`` per second left first. A bid still
+        waiting (for the scheduler or a rate-limit slot) at ``deadline``, or
+        replaced by a newer bid on the same item, is dropped without spending
+        quota. With a ``trace``, the queue wait is reported to it, and it is
+        the current trace while the client sends (limiter / http stages)."""
+        queued_at = time.monotonic()
+        dropped = await self._bids.acquire(item_id, margin, deadline)
+        if trace is not None:
+            trace.observe("queue", time.monotonic() - queued_at)
+        if dropped == "superseded":
+            logger.info(f"[bid] {item_id} dropped — superseded by a newer bid")
+            return BidResult.FAILED
+        if dropped == "stale":
+            logger.info(f"[bid] {item_id} dropped — auction moved on while queued")
+            return BidResult.FAILED
+        try:
             one_trade_retries = 0
             while True:
+                if time.monotonic() >= deadline:
+                    logger.info(f"[bid] {item_id} dropped — auction moved on while queued")
+                    return BidResult.FAILED
                 try:
-                    await self.empire.place_bid(item_id, bid_value, fail_fast_429=True)
+                    token = current_trace.set(trace)
+                    try:
+                        await self.empire.place_bid(item_id, bid_value, fail_fast_429=True,
+                                                    deadline=deadline)
+                    finally:
+                        current_trace.reset(token)
+                    if trace is not None:
+                        trace.finish()
                     logger.info(f"[bid] {item_id} placed {bid_value / 100:.2f} C")
+                    self._book.placed(item_id, bid_value, self._user["id"])
+                    auction = self._book.get(item_id)
+                    self._ledger.reserve(item_id, bid_value,
+                                         auction.ends_at if auction else None)
                     return BidResult.SUCCESS
+                except DeadlineExceeded:
+                    logger.info(f"[bid] {item_id} dropped — no rate-limit slot before deadline")
+                    return BidResult.FAILED
                 except CSGOEmpireError as err:
+                    if trace is not None:
+                        trace.finish()     # the POST is over, accepted or not
                     payload = err.payload if isinstance(err.payload, dict) else {}
                     message = payload.get("message", "")
 
@@ -304,37 +797,53 @@ class BiddingBot:
                         return BidResult.NO_BALANCE
 
                     return BidResult.FAILED
-
-    async def _get_active_auctions(self) -> None:
-        try:
-            resp = await self.empire.get_active_auctions()
-        except CSGOEmpireError as err:
-            logger.error(f"[auction] fetch active failed: {err}")
+        finally:
+            self._bids.release()
+
+    async def _log_latency(self) -> None:
+        while True:
+            await asyncio.sleep(LATENCY_LOG_INTERVAL)
+            self._report_latency()
+
+    def _report_latency(self) -> None:
+        """Log the per-stage summary and dump the raw samples, if any."""
+        for line in self._latency.summary(LATENCY_STAGES):
+            logger.info(f"[latency] {line}")
+        if self._latency_file is None or not self._latency.samples:
             return
-        auctions = resp.get("active_auctions") or []
-        async with self._auctions_lock:
-            self._active_auctions = {a["id"]: a["market_name"] for a in auctions}
-        if not auctions:
-            logger.info("[auction] none active")
-
-    async def _market_name_for(self, item_id) -> str | None:
-        async with self._auctions_lock:
-            return self._active_auctions.get(item_id)
-
-    async def _fresh_bid_max(self, market_name: str) -> int | None:
+        try:
+            self._latency.dump(self._latency_file)
+        except OSError as e:
+            logger.error(f"[latency] dump to {self._latency_file} failed: {e}")
+
+    async def _reconcile_auctions(self) -> None:
+        """Merge the REST list of auctions we're in into the book, at startup
+        and every AUCTION_RECONCILE_INTERVAL — a backstop for websocket events
+        missed across a reconnect, not the book's source."""
+        while True:
+            fetched_at = time.monotonic()
+            try:
+                resp = await self.empire.get_active_auctions()
+            except CSGOEmpireError as err:
+                logger.error(f"[auction] fetch active failed: {err}")
+            else:
+                auctions = resp.get("active_auctions") or []
+                gone = self._book.reconcile(auctions, fetched_at)
+                if gone:
+                    logger.info(f"[auction] reconciled — {len(auctions)} active, "
+                                f"{gone} ended")
+            await asyncio.sleep(AUCTION_RECONCILE_INTERVAL)
+
+    def _fresh_bid_max(self, market_name: str) -> int | None:
         """Our max bid for an item, or None if it isn't priced or the price is
         stale. A stale/NULL price_updated_at means PriceService isn't keeping up,
-        so we refuse to bid on a valuation we can't trust."""
-        row = await self.db.get_item_price(market_name)
+        so we refuse to bid on a valuation we can't trust. Reads the in-memory
+        PriceIndex; the age is still measured from price_updated_at, now."""
+        row = self._prices.lookup(market_name)
         if row is None:
             return None
-        price, updated_at = row
-        if updated_at is None:
-            logger.info(f"[skip] {market_name} — no price timestamp")
-            return None
         now_utc = datetime.now(timezone.utc).replace(tzinfo=None)  # naive UTC, matches DB
-        age = (now_utc - updated_at).total_seconds()
-        if age > PRICE_MAX_AGE:
-            logger.info(f"[skip] {market_name} — stale price ({age / 60:.0f} min old)")
-            return None
-        return int(price)
+        bid_max, reason = _price_verdict(row, now_utc)
+        if reason:
+            logger.info(f"[skip] {market_name} — {reason}")
+        return bid_max
@@ -0,0 +1,117 @@
+"""
+Per-endpoint circuit breakers for the REST clients.
+
+Without one, every call during an outage runs its whole retry ladder
+(``2 ** attempt`` sleeps) while holding a limiter slot or a bucket lock, and the
+calls pile up behind each other. A breaker counts consecutive failures (5xx,
+network errors, timeouts — not 4xx or 429, which prove the server is up) per
+endpoint:
+
+    closed     requests flow; FAILURE_THRESHOLD failures in a row open it
+    open       every request fails at once, for RESET_TIMEOUT seconds
+    half_open  one probe request goes out; success closes the circuit,
+               failure re-opens it, everyone else still fails fast meanwhile
+
+State changes are logged with a ``[circuit]`` tag; ``snapshot()`` feeds the
+clients' ``circuit_stats()``.
+"""
+
+import time
+from typing import Any, Optional
+
+from logger import logger
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    One endpoint's breaker. Callers take a ticket from ``allow()`` before each
+    attempt (None = fail fast), report the outcome with ``success()`` /
+    ``failure()``, and always hand the ticket back to ``release()`` when the
+    attempt is over — that frees the half-open probe if the attempt ended
+    without a verdict (cancelled, deadline, 429), and is a no-op otherwise.
+    """
+    __slots__ = ("name", "failure_threshold", "reset_timeout", "state",
+                 "failures", "opened_at", "probing", "probe", "opened",
+                 "rejected")
+
+    def __init__(self, name: str, *, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0           # consecutive, while closed
+        self.opened_at = 0.0        # monotonic
+        self.probing = False        # the half-open probe is in flight
+        self.probe = 0              # ticket of the latest probe
+        self.opened = 0             # times opened since start
+        self.rejected = 0           # requests failed fast
+
+    def rejects(self) -> bool:
+        """Whether a request would be refused right now (counted in
+        ``rejected``) — a cheap check that changes no state, for failing
+        before any queueing or locking."""
+        if self.state == CLOSED:
+            return False
+        if self.state == OPEN:
+            refused = time.monotonic() - self.opened_at < self.reset_timeout
+        else:
+            refused = self.probing
+        self.rejected += refused
+        return refused
+
+    def allow(self) -> Optional[int]:
+        """Admit one attempt, or None to fail fast. In half-open only the probe
+        is admitted; its ticket is > 0 (0 for attempts while closed)."""
+        if self.state == CLOSED:
+            return 0
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return None
+            self.state = HALF_OPEN
+            logger.info(f"[circuit] {self.name} half-open — sending one probe")
+        if self.probing:
+            self.rejected += 1
+            return None
+        self.probing = True
+        self.probe += 1
+        return self.probe
+
+    def success(self) -> None:
+        self.failures = 0
+        self.probing = False
+        if self.state != CLOSED:
+            self.state = CLOSED
+            logger.info(f"[circuit] {self.name} closed — endpoint recovered")
+
+    def failure(self) -> None:
+        self.probing = False
+        if self.state == CLOSED:
+            self.failures += 1
+            if self.failures < self.failure_threshold:
+                return
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.opened += 1
+        self.failures = 0
+        logger.warning(
+            f"[circuit] {self.name} open — failing fast for "
+            f"{self.reset_timeout:.0f}s")
+
+    def release(self, ticket: int) -> None:
+        """End an admitted attempt. A probe that produced no verdict is given
+        back, so the next caller can probe."""
+        if ticket and ticket == self.probe:
+            self.probing = False
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"state": self.state, "failures": self.failures,
+                "opened": self.opened, "rejected": self.rejected}
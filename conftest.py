@@ -0,0 +1 @@
+"""Puts the repo root on sys.path, so plain ``pytest`` finds its modules."""
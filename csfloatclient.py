@@ -10,6 +10,8 @@ the cross-cutting concerns every call needs:
       headers (CSFloat limits each endpoint separately, e.g. /listings = 200/h
       while /listings/{id}/buy-orders = 20/min)
     - retries on transient failures (429, 5xx, network), honouring the reset time
+    - a circuit breaker per endpoint (circuit.py), so an outage fails calls
+      fast instead of queueing them on the bucket lock behind retry ladders
     - typed CSFloatError instead of bare Exception
 
 No pricing logic lives here. Computing prices, the divider conversion and the
@@ -24,6 +26,8 @@ from typing import Optional
 import aiohttp
 from csfloat_api.csfloat_client import Client
 
+from circuit import CLOSED, CircuitBreaker
+
 API_URL = 'https://csfloat.com/api/v1'
 
 _ID_SEGMENT = re.compile(r"^\d+$")
@@ -38,6 +42,11 @@ class CSFloatError(Exception):
         self.payload = payload
 
 
+class CircuitOpen(CSFloatError):
+    """Raised without sending anything while the endpoint's circuit breaker is
+    open (see circuit.py)."""
+
+
 class _Bucket:
     """Live rate-limit state for one endpoint, learned from response headers."""
     __slots__ = ("limit", "remaining", "reset", "lock")
@@ -67,6 +76,7 @@ class CSFloatClient(Client):
         self._verify_ssl = verify_ssl
         self._session: Optional[aiohttp.ClientSession] = None
         self._buckets: dict[str, _Bucket] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
 
     # ------------------------------------------------------------------ #
     # session lifecycle
@@ -133,14 +143,24 @@ class CSFloatClient(Client):
             raise ValueError('Unsupported HTTP method.')
 
         url = f"{API_URL}{parameters}"
-        bucket = self._buckets.setdefault(self._bucket_key(method, parameters), _Bucket())
+        key = self._bucket_key(method, parameters)
+        bucket = self._buckets.setdefault(key, _Bucket())
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(f"CSFloat {key}")
+        # Fail before queueing on the bucket lock behind calls that will fail too.
+        if breaker.rejects():
+            raise CircuitOpen(f"Circuit open on {key}: failing fast")
         session = self._ensure_session()
         attempt = 0
 
         async with bucket.lock:
             while True:
-                await self._pace(bucket)
+                ticket = breaker.allow()
+                if ticket is None:
+                    raise CircuitOpen(f"Circuit open on {key}: failing fast")
                 try:
+                    await self._pace(bucket)
                     async with session.request(method, url, ssl=self._verify_ssl,
                                                json=json_data) as resp:
                         self._update_bucket(bucket, resp.headers)
@@ -152,13 +172,16 @@ class CSFloatClient(Client):
                             continue  # _pace waits until reset (remaining <= 0)
 
                         if resp.status >= 500:
-                            if attempt >= self.max_retries:
+                            breaker.failure()
+                            # An opened circuit ends the retry ladder too.
+                            if attempt >= self.max_retries or breaker.state != CLOSED:
                                 raise CSFloatError(f"Server error {resp.status}",
                                                    resp.status, await self._safe_body(resp))
                             attempt += 1
                             await asyncio.sleep(2 ** attempt)
                             continue
 
+                        breaker.success()
                         if resp.status != 200:
                             message = self.ERROR_MESSAGES.get(resp.status, f"HTTP {resp.status}")
                             raise CSFloatError(message, resp.status, await self._safe_body(resp))
@@ -170,10 +193,19 @@ class CSFloatClient(Client):
                         return await resp.json()
 
                 except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-                    if attempt >= self.max_retries:
+                    breaker.failure()
+                    if attempt >= self.max_retries or breaker.state != CLOSED:
                         raise CSFloatError(f"Network error: {err}") from err
                     attempt += 1
                     await asyncio.sleep(2 ** attempt)
+                finally:
+                    breaker.release(ticket)
+
+    def circuit_stats(self) -> dict[str, dict]:
+        """Circuit breaker state per endpoint that has ever tripped or is not
+        closed (see circuit.py)."""
+        return {key: breaker.snapshot() for key, breaker in self._breakers.items()
+                if breaker.opened or breaker.state != CLOSED}
 
     @staticmethod
     async def _safe_body(resp):
@@ -10,8 +10,10 @@ Rate limit:  Global request limit per key; exceeding any limit returns HTTP 429
              disagree on the global window: the reference page says 120 / 60s,
              the API-Docs README says 120 / 10s. We use the safer 120 / 60s — if
              the real window is shorter we are merely more conservative; the
-             reverse would 429. Several endpoints carry tighter documented limits
-             (e.g. Place Bid 20/10s, Get Active Trades 3/10s) — see ENDPOINT_LIMITS.
+             reverse would 429. ``adaptive_global=True`` instead probes for
+             the real window at runtime (see _AdaptiveGlobalLimit). Several
+             endpoints carry tighter documented limits (e.g. Place Bid 20/10s,
+             Get Active Trades 3/10s) — see ROUTES.
 
 The client enforces the global limit and the per-endpoint limits proactively
 with token buckets (so it self-throttles before Empire 429s), prioritises money
@@ -19,17 +21,28 @@ actions over bids over polling, and retries on 429 honouring Retry-After.
 """
 
 import asyncio
-import heapq
 import math
+import os
 import re
 import time
-from collections import Counter, deque
+from collections import Counter, defaultdict, deque
 from enum import IntEnum
-from typing import Any, Optional
+from json import dump as _json_dump, dumps as _json_dumps, loads as _stdlib_loads
+from typing import Any, AsyncIterator, Callable, Optional
 
 import aiohttp
 
+from circuit import CLOSED, CircuitBreaker
 from logger import logger
+from metrics import HistogramSet, RingBuffer, current_trace
+
+# Large bodies (get_listed_items(per_page=2500), transactions, inventory) decode
+# several times faster with orjson; it is optional, stdlib json is the fallback.
+# orjson's transient peak is higher (~14x the body vs ~3x), freed on return.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = _stdlib_loads
 
 DEFAULT_HOST = "csgoempire.io"
 
@@ -41,25 +54,132 @@ PRIORITY_HIGH = 0
 PRIORITY_BID = 1
 PRIORITY_NORMAL = 2
 
-# Per-endpoint limits Empire enforces on top of the global limit (any 429 blocks
-# ALL endpoints for 60s, so we throttle preventively to avoid them).
-# Keys are normalised "METHOD /path" with numeric ids collapsed to <id>.
-# Values are (max_requests, window_seconds) set just under Empire's documented
-# caps for headroom. Docs: github.com/OfficialCSGOEmpire/API-Docs.
-ENDPOINT_LIMITS: dict[str, tuple[int, float]] = {
-    "POST /trading/deposit/<id>/bid": (18, 10.0),  # doc 20/10 (success+fail)
-    "GET /trading/user/trades":       (2, 10.0),   # doc 3/10
+# Slots of every global window held back for the more important tiers (see
+# _RateLimiter): polling can fill at most 120 - 25, bids 120 - 5, so a bid burst
+# always finds 20 slots and a money action 5, whatever polling did in the last
+# window. Override with CSGOEmpireClient(reserved=...); {} disables.
+GLOBAL_RESERVED: dict[int, int] = {PRIORITY_HIGH: 5, PRIORITY_BID: 20}
+
+# Every endpoint the client calls and its request policy, defined once. Keys are
+# "METHOD /path" with path parameters as <name>: <id> matches a numeric segment,
+# any other <name> any segment. Compiled per client into a segment trie
+# (_RouteTable), so a request resolves its whole policy without regex work.
+# Per route, all optional:
+#   limit        (max_requests, window_seconds) bucket Empire enforces on top of
+#                the global limit (any 429 blocks ALL endpoints for 60s, so we
+#                throttle preventively), set just under the documented cap for
+#                headroom. Docs: github.com/OfficialCSGOEmpire/API-Docs. Routes
+#                without one are documented as global-only.
+#   priority     rate-limit tier, default PRIORITY_NORMAL
+#   timeout      total seconds, default the client's timeout=
+#   retries      retries after 429 / 5xx / network errors, default the client's
+#                max_retries=
+#   idempotent   safe to resend after a network error or timeout, when the first
+#                attempt may already have landed; default True for GET, PUT and
+#                DELETE. Non-idempotent routes are not resent after those.
+#   cache        (ttl, stale_while_revalidate) seconds, for slow-changing GETs:
+#                within ttl a cached response is returned as-is; for a further
+#                stale_while_revalidate seconds it is still returned, but a
+#                background refetch replaces it. Metadata carries the balance
+#                and the socket token, so it only absorbs bursts; the
+#                automation status carries the token expiry TradeBot sleeps
+#                until, so it is never served stale either.
+#   invalidates  cached GET routes a successful call makes stale
+# create_withdrawal's documented cap (8/10 success, 2/10 failure) has no bucket
+# because the bots don't call it; add a limit if it gets wired up.
+ROUTES: dict[str, dict[str, Any]] = {
+    # -- account / automation
+    "GET /metadata/socket":                    {"cache": (5.0, 0.0)},
+    "GET /trading/automation/status":          {"cache": (30.0, 0.0)},
+    "PUT /trading/automation/access-token":    {
+        "invalidates": ("GET /trading/automation/status",)},
+    "DELETE /trading/automation/access-token": {
+        "invalidates": ("GET /trading/automation/status",)},
+    "POST /trading/automation/check-trades":   {"idempotent": True},
+    "POST /trading/user/settings":             {"idempotent": True},
+    "GET /user/transactions":                  {},
+    "POST /user/tip":                          {
+        "invalidates": ("GET /metadata/socket",)},
+    # -- trades and auctions
+    "GET /trading/user/trades":                {"limit": (2, 10.0)},   # doc 3/10
+    "GET /trading/user/trade/<id>/<type>":     {},
+    "GET /trading/user/auctions":              {},
+    # -- money actions (TradeBot): never wait behind a bid burst
+    "POST /trading/deposit/<id>/received":     {"priority": PRIORITY_HIGH,
+                                                "idempotent": True},
+    "POST /trading/deposit/<id>/dispute":      {"priority": PRIORITY_HIGH,
+                                                "idempotent": True},
+    "POST /trading/deposit/<id>/withdraw":     {
+        "priority": PRIORITY_HIGH,
+        "invalidates": ("GET /metadata/socket", "GET /trading/user/inventory")},
+    # -- bids: a reply later than this is too late to matter anyway
+    "POST /trading/deposit/<id>/bid":          {
+        "priority": PRIORITY_BID, "limit": (18, 10.0),  # doc 20/10 (success+fail)
+        "timeout": 10.0, "invalidates": ("GET /metadata/socket",)},
+    # -- deposits (listings)
+    "POST /trading/deposit":                   {
+        "limit": (18, 10.0),                            # doc 20/10 (create_deposits)
+        "invalidates": ("GET /trading/user/inventory",)},
+    "POST /trading/deposit/cancel":            {
+        "idempotent": True, "invalidates": ("GET /trading/user/inventory",)},
+    "POST /trading/deposit/<id>/cancel":       {
+        "idempotent": True, "invalidates": ("GET /trading/user/inventory",)},
+    "POST /trading/deposit/<id>/sell":         {
+        "invalidates": ("GET /metadata/socket", "GET /trading/user/inventory")},
+    "POST /trading/deposit/<id>/sent":         {"idempotent": True},
+    "GET /trading/deposit/status/<code>":      {},
+    "GET /trading/deposit/<id>/stats":         {},
+    "PATCH /trading/deposit/<id>":             {"idempotent": True},
+    "PATCH /trading/deposit/bulk":             {"idempotent": True},
+    # -- marketplace, inventory, block list
+    "GET /trading/items":                      {},
+    "GET /trading/user/inventory":             {"cache": (60.0, 60.0)},
+    "GET /trading/block-list":                 {"cache": (300.0, 300.0)},
+    "POST /trading/block-list/<id>":           {
+        "idempotent": True, "invalidates": ("GET /trading/block-list",)},
+    "DELETE /trading/block-list/<id>":         {
+        "invalidates": ("GET /trading/block-list",)},
 }
-# Only endpoints we actually call AND that Empire caps below the global limit get
-# a bucket. Omitted because currently unused (add back if wired up, using their
-# documented caps): create_deposit (POST /trading/deposit, 20/10),
-# create_withdrawal (POST /trading/deposit/<id>/withdraw, 8/10 success, 2/10
-# failure). Everything else we call (auctions, metadata, automation status/token,
-# mark-received, dispute) is documented as global-only, so the global limiter
-# covers it.
 
-# Endpoints not listed fall back to the global limiter only (e.g. get_metadata,
-# get_active_auctions, mark_as_received, dispute_trade — documented as global).
+# Connection pool for the REST session. A bid racing an auction shouldn't pay
+# for DNS + TCP + TLS, so the pool keeps a few connections open: the DNS answer
+# is cached, idle connections are kept for KEEPALIVE_TIMEOUT, WARM_CONNECTIONS
+# are opened up front at __aenter__, and the optional background keep-alive
+# (keepalive_interval=) touches the pool after that many idle seconds.
+POOL_SIZE = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75.0
+WARM_CONNECTIONS = 2
+
+# Opt-in hedging of GETs (CSGOEmpireClient(hedge_percentile=...)): a GET still
+# unanswered after that percentile of its endpoint's last HEDGE_SAMPLES
+# latencies gets one duplicate, and the first answer wins. Hedges only use
+# spare budget — a free slot that leaves every bucket it touches at most
+# HEDGE_MAX_UTILISATION full, with nobody queued — so they can't push real
+# requests back or into a 429. No hedging before HEDGE_MIN_SAMPLES are known.
+HEDGE_SAMPLES = 100
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MAX_UTILISATION = 0.5
+
+# Limiter state file (CSGOEmpireClient(state_file=...)): the slots used in the
+# current windows and any 429 block are saved every STATE_SAVE_INTERVAL seconds,
+# right after a 429, and at close(), then restored at startup — so a bot that
+# restarts mid-window doesn't burst into a 429 and a 60s block of everything.
+STATE_SAVE_INTERVAL = 10.0
+
+# Per-request item cap of the bulk listing endpoints (POST /trading/deposit,
+# PATCH /trading/deposit/bulk); create_deposits / bulk_update_listing_prices_all
+# split larger batches into chunks of this size.
+BULK_MAX_ITEMS = 20
+
+# Opt-in adaptive global limit (CSGOEmpireClient(adaptive_global=True)). The
+# documented global windows are 120/60s and 120/10s, so the estimate starts at
+# the safe 60s and is probed towards 10s with AIMD: each window that ran full
+# without a 429 adds ADAPTIVE_INCREASE req/s, a 429 multiplies the rate by
+# ADAPTIVE_DECREASE and caps further probing just below the rate that tripped.
+ADAPTIVE_MIN_WINDOW = 10.0
+ADAPTIVE_INCREASE = 0.1
+ADAPTIVE_DECREASE = 0.5
 
 
 class TradeStatus(IntEnum):
@@ -92,6 +212,40 @@ class CSGOEmpireError(Exception):
         self.payload = payload
 
 
+class DeadlineExceeded(CSGOEmpireError):
+    """Raised when a request can't get a rate-limit slot (or finish its retry
+    backoff) before the caller's deadline. Nothing was sent for it, so no quota
+    was spent."""
+
+
+class CircuitOpen(CSGOEmpireError):
+    """Raised without sending anything while the endpoint's circuit breaker is
+    open (see circuit.py): it just failed repeatedly, so calls fail fast until
+    a probe request shows it has recovered."""
+
+
+class BulkError(CSGOEmpireError):
+    """Raised by create_deposits / bulk_update_listing_prices_all when a chunk
+    failed with something other than a CSGOEmpireError. The other chunks may
+    well have landed, so ``report`` holds the full ``_bulk`` report, with the
+    failing chunk's items under "failed": retry from it, not from scratch."""
+
+    def __init__(self, message: str, report: dict[str, Any]):
+        super().__init__(message, payload=report)
+        self.report = report
+
+
+class _WaitQueue(deque):
+    """A _RateLimiter FIFO: queued futures, with their arrival seqs alongside
+    rather than paired in a tuple per waiter, which would be one more object
+    per acquire for the garbage collector to track."""
+    __slots__ = ("seqs",)
+
+    def __init__(self):
+        super().__init__()
+        self.seqs: deque[int] = deque()
+
+
 class _RateLimiter:
     """
     Async token bucket over a rolling time window, with priority.
@@ -99,72 +253,776 @@ class _RateLimiter:
     Keeps at most ``max_requests`` acquisitions inside any ``window`` seconds.
     Acquirers pass a priority (lower = served first); when the window is
     saturated the lowest-priority-number waiter takes the next free slot, so a
-    money action outranks a bid and a bid outranks background polling. A single
-    dispatcher task hands out the slots, so slot ordering is well defined and
-    there is no race on the timestamp window even when many coroutines (TradeBot
-    + BiddingBot) share one limiter.
+    money action outranks a bid and a bid outranks background polling.
+
+    Priority alone only orders a saturated window; it can't stop polling from
+    filling the whole window during a quiet spell. ``reserved`` keeps slots
+    back for the more important tiers: ``{PRIORITY_HIGH: 5, PRIORITY_BID: 20}``
+    lets a bid use all but 5 slots of the window and polling all but 25, so a
+    bid burst always finds 20 slots whatever polling has done. ``weights``
+    (optional) replaces strict priority with weighted fair sharing between
+    tiers that can all be granted (start-time fair queuing: each grant
+    advances its tier's virtual time by 1 / weight), so a sustained bid burst
+    can't starve polling outright either.
+
+    Slots are handed out by a deadline scheduler rather than a polling loop: a
+    single loop timer is armed for the instant the next slot frees (the oldest
+    timestamp leaving the window, or the end of a ``block_for`` pause), or for
+    the next loop pass when one is free already, so every acquire made in the
+    same tick competes by priority before any of them is granted. Nothing
+    wakes up while no slot can be granted, and a cancelled waiter leaves the
+    queue immediately, so it never delays the live ones behind it.
+
+    Time comes from ``clock`` (default time.monotonic) and waiting from the
+    running loop's timers, so on a virtual-time loop with ``clock=loop.time``
+    the limiter runs on simulated time (benchmarks/limiter_sim.py). Limiters
+    passed as ``also`` must share the clock.
+
+    ``acquire(also=...)`` takes a slot here *and* in every other limiter listed,
+    all or nothing: the slots are recorded together at the moment all of them
+    are free, so a request never burns an endpoint slot while it is still
+    queued for the global one. Waiters are queued per (bucket set, priority);
+    whenever a slot frees, the best-ranked queue head whose buckets are all
+    free goes next, which keeps priority order across requests that share this
+    limiter.
     """
 
-    def __init__(self, max_requests: int, window: float):
+    def __init__(self, max_requests: int, window: float, *,
+                 reserved: Optional[dict[int, int]] = None,
+                 weights: Optional[dict[int, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if reserved and sum(reserved.values()) >= max_requests:
+            raise ValueError(
+                f"reserved slots {reserved} leave nothing of {max_requests}")
         self.max_requests = max_requests
         self.window = window
+        self._clock = clock
+        self._reserved = dict(reserved or {})
+        self._weights = dict(weights) if weights else None
         self._timestamps: deque[float] = deque()
         # Hard pause until this monotonic time, set when the API reports it is
         # out of quota (X-RateLimit-Remaining: 0 or a 429 Retry-After).
         self._blocked_until = 0.0
-        # Min-heap of (priority, seq, future); lower priority served first.
-        # seq breaks ties FIFO within a priority class.
-        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        # One FIFO of waiters per extra buckets, then priority. Everyone in a
+        # queue shares the priority and seq only grows, so arrival order
+        # already is (priority, seq) order and no heap is needed. A waiter that
+        # is cancelled or times out leaves ``_queued`` at once; its entry is
+        # skipped when it reaches the front. ``_queued`` counts live waiters.
+        self._queues: dict[tuple["_RateLimiter", ...],
+                           dict[int, _WaitQueue]] = {}
+        self._queued = 0
         self._seq = 0
-        self._dispatcher: Optional[asyncio.Task] = None
+        # Fair-share virtual time per priority tier (only with ``weights``).
+        self._vtime: dict[int, float] = {}
+        self._vclock = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = math.inf
+
+    def _capacity(self, priority: Optional[int]) -> int:
+        """Slots of the window ``priority`` may use: all of them minus what is
+        reserved for the tiers ranked above it."""
+        if priority is None or not self._reserved:
+            return self.max_requests
+        return self.max_requests - sum(
+            n for tier, n in self._reserved.items() if tier < priority)
 
     def _drain_expired(self, now: float) -> None:
-        while self._timestamps and now - self._timestamps[0] >= self.window:
+        # Same expression as _next_slot_at's "ts + window": with "now - ts"
+        # the two can disagree by an ulp, and a slot _next_slot_at reports
+        # free would still be counted as used — granting one over capacity.
+        while self._timestamps and self._timestamps[0] + self.window <= now:
             self._timestamps.popleft()
 
-    def _delay_until_slot(self, now: float) -> float:
-        """Seconds until a slot is free, or 0.0 if one is free right now."""
+    def _next_slot_at(self, now: float, priority: Optional[int] = None) -> float:
+        """Monotonic time the next slot usable at ``priority`` frees (``now``
+        if one is free already); None ignores reservations."""
         if now < self._blocked_until:
-            return self._blocked_until - now
+            return self._blocked_until
         self._drain_expired(now)
-        if len(self._timestamps) < self.max_requests:
-            return 0.0
-        return self.window - (now - self._timestamps[0])
+        used = len(self._timestamps)
+        capacity = self._capacity(priority) if self._reserved else self.max_requests
+        if used < capacity:
+            return now
+        return self._timestamps[used - capacity] + self.window
+
+    def _ready_at(self, also: tuple["_RateLimiter", ...], priority: int,
+                  now: float) -> float:
+        """Earliest time this limiter and every one in ``also`` have a slot."""
+        at = self._next_slot_at(now, priority)
+        for limiter in also:
+            at = max(at, limiter._next_slot_at(now, priority))
+        return at
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL, *,
+                      also: tuple["_RateLimiter", ...] = (),
+                      deadline: Optional[float] = None) -> float:
+        """
+        Wait for a slot (here and in every limiter in ``also``); returns the
+        monotonic time it was granted (the timestamp recorded for it).
 
-    async def acquire(self, priority: int = PRIORITY_NORMAL) -> None:
-        fut = asyncio.get_running_loop().create_future()
-        heapq.heappush(self._waiters, (priority, self._seq, fut))
+        deadline: monotonic time by which the slot must be granted. A waiter
+        still queued then is dropped without using a slot and raises
+        DeadlineExceeded; one whose buckets can't free in time fails at once.
+        """
+        tiers = self._queues.get(also)
+        queue = tiers.get(priority) if tiers is not None else None
+        # Behind a waiter on the same buckets and priority, the timer is
+        # already armed no later than our slot can free: only a deadline
+        # needs the exact time.
+        ready = math.inf
+        if queue is None or deadline is not None:
+            now = self._clock()
+            ready = self._ready_at(also, priority, now)
+            if deadline is not None and ready > deadline:
+                raise DeadlineExceeded("no rate-limit slot before the deadline")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        seq = self._seq
         self._seq += 1
-        self._ensure_dispatcher()
-        await fut
+        if queue is None:
+            if tiers is None:
+                tiers = self._queues[also] = {}
+            queue = tiers[priority] = _WaitQueue()
+        queue.append(future)
+        queue.seqs.append(seq)
+        self._queued += 1
+        # Even a free slot is granted on the next loop pass, not here: a more
+        # urgent caller arriving later in this tick must still go first. A
+        # timer due no later than that stays as it is.
+        if ready < self._timer_at:
+            self._arm(ready)
+        expiry = None
+        if deadline is not None:
+            expiry = loop.call_later(deadline - now, self._expire, future)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.cancelled():      # still queued
+                self._leave()
+            elif future.done() and future.exception() is None:
+                # Granted in the same tick the caller was cancelled: nothing
+                # was sent, so hand the slots back to whoever is next.
+                granted_at = future.result()
+                for limiter in (self, *also):
+                    limiter._refund(granted_at)
+                self._schedule()
+            raise
+        finally:
+            if expiry is not None:
+                expiry.cancel()
+
+    def try_acquire(self, priority: int = PRIORITY_NORMAL, *,
+                    also: tuple["_RateLimiter", ...] = (),
+                    max_utilisation: float = 1.0) -> bool:
+        """
+        Take a slot here and in ``also`` only if that needs no waiting, nobody
+        is queued, and afterwards no bucket is more than ``max_utilisation``
+        of its capacity at ``priority`` full. Returns whether it did.
+        """
+        if self._queued:
+            return False
+        now = self._clock()
+        for limiter in (self, *also):
+            if now < limiter._blocked_until:
+                return False
+            limiter._drain_expired(now)
+            allowed = limiter._capacity(priority) * max_utilisation
+            if len(limiter._timestamps) + 1 > allowed:
+                return False
+        self._record(also, now)
+        return True
+
+    def _expire(self, future: asyncio.Future) -> None:
+        if future.done():
+            return
+        self._leave()
+        future.set_exception(
+            DeadlineExceeded("no rate-limit slot before the deadline"))
+
+    def _leave(self) -> None:
+        """A queued waiter gave up; with nobody left, drop its entry (and any
+        other skipped ones) and the timer."""
+        self._queued -= 1
+        if not self._queued:
+            self._queues.clear()
+            self._disarm()
+
+    def _record(self, also: tuple["_RateLimiter", ...], now: float) -> None:
+        self._timestamps.append(now)
+        for limiter in also:
+            limiter._timestamps.append(now)
+
+    def _drop_queue(self, also: tuple["_RateLimiter", ...], priority: int) -> None:
+        tiers = self._queues[also]
+        del tiers[priority]
+        if not tiers:
+            del self._queues[also]
+
+    def _refund(self, granted_at: float) -> None:
+        try:
+            self._timestamps.remove(granted_at)
+        except ValueError:
+            pass
 
-    def _ensure_dispatcher(self) -> None:
-        if self._dispatcher is None or self._dispatcher.done():
-            self._dispatcher = asyncio.ensure_future(self._dispatch())
+    def _rank(self, priority: int, seq: int) -> tuple:
+        """Order among grantable queue heads: strict priority, or the tier's
+        fair-share virtual start time when ``weights`` is set."""
+        if self._weights is None:
+            return (priority, seq)
+        return (max(self._vtime.get(priority, 0.0), self._vclock), priority, seq)
 
-    async def _dispatch(self) -> None:
-        # One unexpected error must not silently kill the dispatcher and strand
-        # every queued waiter, so each iteration is guarded; the loop keeps going.
-        while self._waiters:
-            try:
-                delay = self._delay_until_slot(time.monotonic())
-                if delay > 0.0:
-                    await asyncio.sleep(delay)
-                    continue
-                _, _, fut = heapq.heappop(self._waiters)
-                if fut.done():           # caller cancelled while queued
-                    continue
-                self._timestamps.append(time.monotonic())
-                fut.set_result(None)
-            except asyncio.CancelledError:
-                raise
-            except Exception:
-                logger.exception("[ratelimit] dispatcher iteration error — continuing")
+    def _charge(self, priority: int) -> None:
+        if self._weights is None:
+            return
+        start = max(self._vtime.get(priority, 0.0), self._vclock)
+        self._vclock = start
+        self._vtime[priority] = start + 1.0 / self._weights.get(priority, 1.0)
+
+    def _schedule(self) -> None:
+        """Grant every slot that is free now, then arm one timer for the next."""
+        try:
+            now = self._clock()
+            while self._queued:
+                best: Optional[tuple[tuple, tuple, int, _WaitQueue]] = None
+                second: Optional[tuple] = None   # runner-up rank
+                next_at = math.inf
+                emptied = None
+                for also, tiers in self._queues.items():
+                    for priority, queue in tiers.items():
+                        while queue and queue[0].done():    # gave up already
+                            queue.popleft()
+                            queue.seqs.popleft()
+                        if not queue:
+                            emptied = emptied or []
+                            emptied.append((also, priority))
+                            continue
+                        at = self._ready_at(also, priority, now)
+                        if at > now:
+                            if at < next_at:
+                                next_at = at
+                            continue
+                        rank = self._rank(priority, queue.seqs[0])
+                        if best is None or rank < best[0]:
+                            if best is not None:
+                                second = best[0]
+                            best = (rank, also, priority, queue)
+                        elif second is None or rank < second:
+                            second = rank
+                if emptied:
+                    for also, priority in emptied:
+                        self._drop_queue(also, priority)
+                if best is None:
+                    self._arm(next_at)
+                    return
+                _, also, priority, queue = best
+                # Keep granting from this queue while its buckets have room and
+                # its head still outranks every other grantable head: granting
+                # only fills buckets, so no other queue can have become ready.
+                # The buckets were drained at ``now`` by _ready_at just above.
+                buckets = (self, *also)
+                stamps = [limiter._timestamps for limiter in buckets]
+                room = min(limiter._capacity(priority) - len(limiter._timestamps)
+                           for limiter in buckets)
+                weighted = self._weights is not None
+                while True:
+                    future = queue.popleft()
+                    queue.seqs.popleft()
+                    self._queued -= 1
+                    for timestamps in stamps:
+                        timestamps.append(now)
+                    if weighted:
+                        self._charge(priority)
+                    future.set_result(now)
+                    room -= 1
+                    while queue and queue[0].done():
+                        queue.popleft()
+                        queue.seqs.popleft()
+                    if not queue:
+                        self._drop_queue(also, priority)
+                        break
+                    if weighted or room <= 0 or (
+                            second is not None and second < (priority, queue.seqs[0])):
+                        break
+            self._queues.clear()    # only skipped entries are left
+            self._disarm()
+        except Exception:
+            # One unexpected error must not strand every queued waiter: retry on
+            # the next tick rather than leaving no timer armed.
+            logger.exception("[ratelimit] dispatch error — retrying")
+            self._arm(self._clock())
+
+    def _arm(self, when: float) -> None:
+        if self._timer is not None:
+            # An earlier timer stays: it finds nothing to grant and re-arms,
+            # which is cheaper than a cancel and a new handle per change.
+            if self._timer_at <= when:
+                return
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer_at = when
+        self._timer = loop.call_later(max(0.0, when - self._clock()),
+                                      self._on_timer)
+
+    def _disarm(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_at = math.inf
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._timer_at = math.inf
+        self._schedule()
 
     def block_for(self, seconds: float) -> None:
         """Force every caller to wait at least ``seconds`` from now."""
-        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
-        self._ensure_dispatcher()
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        if self._queued:
+            self._schedule()
+
+    def set_window(self, window: float) -> None:
+        """Resize the rolling window in place; queued waiters are re-timed."""
+        self.window = window
+        if self._queued:
+            self._schedule()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        The quota used in the current window and the block deadline, as
+        wall-clock (epoch) times: monotonic time restarts with the process,
+        wall time carries across a restart. Restore with ``restore``.
+        """
+        now = self._clock()
+        to_wall = time.time() - now
+        self._drain_expired(now)
+        return {
+            "timestamps": [ts + to_wall for ts in self._timestamps],
+            "blocked_until": (self._blocked_until + to_wall
+                              if self._blocked_until > now else None),
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """
+        Merge a ``snapshot`` (possibly from a previous process) into this
+        limiter, converted back to this process's monotonic clock. Slots older
+        than the window are dropped; times in the future (the wall clock went
+        backwards) are clamped to now, which only makes us more careful.
+        """
+        now = self._clock()
+        to_monotonic = now - time.time()
+        restored = [min(now, ts + to_monotonic)
+                    for ts in state.get("timestamps") or ()]
+        self._timestamps = deque(sorted(
+            [*self._timestamps, *(ts for ts in restored
+                                  if ts + self.window > now)]))
+        blocked_until = state.get("blocked_until")
+        if blocked_until is not None:
+            self._blocked_until = max(self._blocked_until,
+                                      blocked_until + to_monotonic)
+        if self._queued:
+            self._schedule()
+
+
+def _save_limiters(path: str, limiters: dict[str, _RateLimiter]) -> None:
+    """
+    Write the limiters' snapshots to ``path`` (via a temp file and rename, so
+    a crash mid-write leaves the previous state). Failures are only logged —
+    losing the state costs caution after a restart, nothing more.
+    """
+    state = {"saved_at": time.time(),
+             "limiters": {name: limiter.snapshot()
+                          for name, limiter in limiters.items()}}
+    tmp = f"{path}.tmp"
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tmp, "w") as file:
+            _json_dump(state, file)
+        os.replace(tmp, path)
+    except OSError as err:
+        logger.warning(f"[ratelimit] could not save limiter state: {err}")
+
+
+def _load_limiters(path: str, limiters: dict[str, _RateLimiter]) -> Optional[int]:
+    """Restore what ``_save_limiters`` wrote into ``limiters`` (by name);
+    returns the slots now held, or None if there was nothing usable."""
+    try:
+        with open(path) as file:
+            state = _stdlib_loads(file.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        logger.warning(f"[ratelimit] ignoring unreadable limiter state: {err}")
+        return None
+    restored = 0
+    for name, snapshot in state.get("limiters", {}).items():
+        limiter = limiters.get(name)
+        if limiter is not None:
+            limiter.restore(snapshot)
+            restored += len(limiter._timestamps)
+    return restored
+
+
+class _AdaptiveGlobalLimit:
+    """
+    AIMD search for the real global window, driving a live ``_RateLimiter``.
+
+    The request count stays at the limiter's ``max_requests``; what adapts is
+    the window, i.e. the allowed rate. The rate only grows when the window is
+    actually full (demand exceeds what we allow) and a whole window has passed
+    since the last change without a 429 — an idle client proves nothing. A 429
+    cuts the rate by ``ADAPTIVE_DECREASE`` and lowers the ceiling to one step
+    under the rate that tripped, so the additive climb stops there and the
+    estimate settles instead of oscillating into a 60s block every few minutes.
+    """
+
+    def __init__(self, limiter: _RateLimiter, *,
+                 min_window: float = ADAPTIVE_MIN_WINDOW):
+        self._limiter = limiter
+        self._floor = limiter.max_requests / limiter.window
+        self.ceiling = limiter.max_requests / min_window
+        self.rate = self._floor
+        self.limited = 0                # 429s seen since start
+        self._changed_at = time.monotonic()
+
+    @property
+    def settled(self) -> bool:
+        """True once a 429 has capped the climb and the rate has reached it."""
+        return self.limited > 0 and self.rate >= self.ceiling
+
+    def estimate(self) -> dict[str, Any]:
+        return {
+            "max_requests": self._limiter.max_requests,
+            "window": round(self._limiter.window, 2),
+            "rate": round(self.rate, 3),
+            "ceiling": round(self.ceiling, 3),
+            "limited": self.limited,
+            "settled": self.settled,
+        }
+
+    def on_success(self) -> None:
+        now = time.monotonic()
+        limiter = self._limiter
+        if (self.rate >= self.ceiling
+                or now - self._changed_at < limiter.window
+                or len(limiter._timestamps)
+                < limiter.max_requests - sum(limiter._reserved.values())):
+            return
+        self._apply(min(self.ceiling, self.rate + ADAPTIVE_INCREASE), now)
+
+    def on_429(self, recent: int) -> None:
+        """``recent``: requests this process sent in the trailing window."""
+        self.limited += 1
+        tripped = self.rate
+        self.ceiling = max(self._floor, tripped - ADAPTIVE_INCREASE)
+        logger.warning(
+            f"[ratelimit] adaptive: 429 at {tripped:.2f} req/s "
+            f"({recent} in trailing {self._limiter.window:.0f}s) — "
+            f"ceiling now {self.ceiling:.2f} req/s")
+        self._apply(max(self._floor, tripped * ADAPTIVE_DECREASE), time.monotonic())
+
+    def _apply(self, rate: float, now: float) -> None:
+        self.rate = rate
+        self._changed_at = now
+        self._limiter.set_window(self._limiter.max_requests / rate)
+        logger.info(
+            f"[ratelimit] adaptive global limit: {self._limiter.max_requests} / "
+            f"{self._limiter.window:.1f}s ({rate:.2f} req/s"
+            f"{', settled' if self.settled else ''})")
+
+
+class _Route:
+    """One ROUTES entry compiled for a client: the endpoint key plus the
+    bucket, priority, timeout, retries, idempotency and cache policy that
+    every request to it uses, and its circuit breaker."""
+    __slots__ = ("key", "also", "priority", "timeout", "max_retries",
+                 "idempotent", "cache", "invalidates", "breaker")
+
+    def __init__(self, key: str, spec: dict[str, Any],
+                 also: tuple[_RateLimiter, ...],
+                 timeout: aiohttp.ClientTimeout, max_retries: int):
+        method = key.split(" ", 1)[0]
+        self.key = key
+        self.also = also
+        self.priority = spec.get("priority", PRIORITY_NORMAL)
+        self.timeout = (aiohttp.ClientTimeout(total=spec["timeout"])
+                        if "timeout" in spec else timeout)
+        self.max_retries = spec.get("retries", max_retries)
+        self.idempotent = spec.get("idempotent",
+                                   method in ("GET", "PUT", "DELETE"))
+        self.cache: Optional[tuple[float, float]] = spec.get("cache")
+        self.invalidates: tuple[str, ...] = spec.get("invalidates", ())
+        self.breaker = CircuitBreaker(f"Empire {key}")
+
+
+class _RouteTable:
+    """
+    ROUTES compiled into one segment trie per method, each leaf holding its
+    _Route. Resolving "/trading/deposit/312345678/bid" is a split plus one
+    dict lookup per segment — a segment with no literal branch takes the
+    <id> branch if it is numeric, else the <name> one — so the hot path does
+    no regex work. Paths not in ROUTES get a default route keyed by
+    ``CSGOEmpireClient._endpoint_key``, built per call (they shouldn't happen).
+    Endpoint buckets are created here, one per route with a ``limit``.
+    """
+
+    def __init__(self, routes: dict[str, dict[str, Any]], *,
+                 timeout: aiohttp.ClientTimeout, max_retries: int):
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self.routes: dict[str, _Route] = {}
+        self.limiters: dict[str, _RateLimiter] = {}
+        self._roots: dict[str, dict] = {}
+        for key, spec in routes.items():
+            if "limit" in spec:
+                self.limiters[key] = _RateLimiter(*spec["limit"])
+            also = (self.limiters[key],) if key in self.limiters else ()
+            route = self.routes[key] = _Route(key, spec, also, timeout,
+                                              max_retries)
+            method, pattern = key.split(" ", 1)
+            node = self._roots.setdefault(method, {})
+            for segment in pattern.split("/")[1:]:
+                if segment.startswith("<") and segment != "<id>":
+                    segment = "<name>"
+                node = node.setdefault(segment, {})
+            node[None] = route
+        for route in self.routes.values():
+            for target in route.invalidates:
+                if self.routes.get(target) is None or not self.routes[target].cache:
+                    raise ValueError(
+                        f"{route.key} invalidates {target}, not a cached route")
+
+    def resolve(self, method: str, path: str) -> _Route:
+        node = self._roots.get(method)
+        if node is not None:
+            for segment in path.split("/")[1:]:
+                child = node.get(segment)
+                if child is None and segment.isdigit():
+                    child = node.get("<id>")
+                if child is None:
+                    child = node.get("<name>")
+                    if child is None:
+                        break
+                node = child
+            else:
+                route = node.get(None)
+                if route is not None:
+                    return route
+        return _Route(CSGOEmpireClient._endpoint_key(method, path), {}, (),
+                      self._timeout, self._max_retries)
+
+
+class _Flight:
+    """One in-flight GET shared by every caller that asked for it."""
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class _RequestLedger:
+    """
+    Fixed-memory record of what the client spends its rate limit on.
+
+    Per endpoint ("METHOD /path" as in ROUTES): requests sent, status
+    codes (0 = network error, no response), HTTP latency histograms. Per
+    priority: limiter queue-wait histograms and deadline drops. For 429
+    attribution it keeps the requests sent in the trailing global window with
+    running per-endpoint counts, so a 429 snapshot is a copy of a small Counter
+    rather than a rescan of the window; the last few snapshots are kept.
+    When the calling task is traced (metrics.current_trace), its queue wait
+    and HTTP time are also reported to the trace as ``limiter`` / ``http``.
+    """
+
+    def __init__(self, limiter: _RateLimiter, *, snapshots: int = 16):
+        self._limiter = limiter
+        self.sent: Counter = Counter()
+        self.statuses: defaultdict[str, Counter] = defaultdict(Counter)
+        self.latency = HistogramSet()
+        self.queue_wait = HistogramSet()
+        self.dropped: Counter = Counter()
+        self._trailing: deque[tuple[float, str]] = deque()
+        self._trailing_counts: Counter = Counter()
+        self.limited = RingBuffer(snapshots)
+        # Latest successful latencies per endpoint, for the hedging delay.
+        self.recent: defaultdict[str, RingBuffer] = defaultdict(
+            lambda: RingBuffer(HEDGE_SAMPLES))
+        self.hedges: defaultdict[str, Counter] = defaultdict(Counter)
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._limiter.window
+        trailing, counts = self._trailing, self._trailing_counts
+        while trailing and trailing[0][0] < cutoff:
+            _, endpoint = trailing.popleft()
+            counts[endpoint] -= 1
+            if not counts[endpoint]:
+                del counts[endpoint]
+
+    def record_sent(self, endpoint: str, priority: int, waited: float) -> None:
+        now = time.monotonic()
+        self.sent[endpoint] += 1
+        self.queue_wait.observe(priority, waited)
+        trace = current_trace.get()
+        if trace is not None:
+            trace.observe("limiter", waited)
+        self._trailing.append((now, endpoint))
+        self._trailing_counts[endpoint] += 1
+        self._expire(now)
+
+    def record_dropped(self, endpoint: str, priority: int) -> None:
+        self.dropped[(endpoint, priority)] += 1
+
+    def record_response(self, endpoint: str, status: int, seconds: float) -> None:
+        self.statuses[endpoint][status] += 1
+        self.latency.observe(endpoint, seconds)
+        trace = current_trace.get()
+        if trace is not None:
+            trace.observe("http", seconds)
+        if 200 <= status < 300:
+            self.recent[endpoint].append(seconds)
+
+    def recent_latency(self, endpoint: str, percentile: float) -> Optional[float]:
+        """``percentile`` of the endpoint's recent successful latencies, or
+        None while fewer than HEDGE_MIN_SAMPLES are known."""
+        recent = self.recent.get(endpoint)
+        if recent is None or len(recent) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(recent)
+        return ordered[min(len(ordered) - 1,
+                           int(len(ordered) * percentile / 100))]
+
+    def report_429(self, endpoint: str, method: str, path: str) -> int:
+        """Log and keep who filled the trailing window; returns its size."""
+        self._expire(time.monotonic())
+        recent = len(self._trailing)
+        by_endpoint = self._trailing_counts.most_common()
+        self.limited.append({
+            "at": time.time(),
+            "endpoint": endpoint,
+            "window": self._limiter.window,
+            "requests": recent,
+            "by_endpoint": dict(by_endpoint),
+        })
+        breakdown = ", ".join(f"{ep}={n}" for ep, n in by_endpoint)
+        logger.warning(
+            f"[ratelimit] 429 on {method} {path} — "
+            f"{recent} requests this process in trailing "
+            f"{self._limiter.window:.0f}s | {breakdown}")
+        return recent
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "sent": dict(self.sent),
+            "statuses": {ep: dict(c) for ep, c in self.statuses.items()},
+            "latency": self.latency.snapshot(),
+            "queue_wait": self.queue_wait.snapshot(),
+            "dropped": {f"{ep} p{prio}": n
+                        for (ep, prio), n in self.dropped.items()},
+            "hedges": {ep: dict(c) for ep, c in self.hedges.items()},
+            "trailing_window": dict(self._trailing_counts),
+            "recent_429s": list(self.limited),
+        }
+
+
+class _ConnectionStats:
+    """
+    Connection-reuse counters fed by an aiohttp TraceConfig: how many requests
+    reused a pooled connection vs opened a new one, DNS cache hits/misses, and
+    how long new connections took to set up (DNS + TCP + TLS).
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.connect = HistogramSet()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_reuseconn.append(self._on_reuse)
+        trace.on_connection_create_start.append(self._on_create_start)
+        trace.on_connection_create_end.append(self._on_create_end)
+        trace.on_dns_cache_hit.append(self._on_dns_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_miss)
+        return trace
+
+    async def _on_reuse(self, session, ctx, params) -> None:
+        self.counts["reused"] += 1
+
+    async def _on_create_start(self, session, ctx, params) -> None:
+        ctx.connect_started = time.monotonic()
+
+    async def _on_create_end(self, session, ctx, params) -> None:
+        self.counts["created"] += 1
+        self.connect.observe("new", time.monotonic() - ctx.connect_started)
+
+    async def _on_dns_hit(self, session, ctx, params) -> None:
+        self.counts["dns_hit"] += 1
+
+    async def _on_dns_miss(self, session, ctx, params) -> None:
+        self.counts["dns_miss"] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        reused, created = self.counts["reused"], self.counts["created"]
+        return {
+            **{kind: self.counts[kind]
+               for kind in ("reused", "created", "dns_hit", "dns_miss")},
+            "reuse_ratio": round(reused / (reused + created), 3)
+                           if reused + created else None,
+            "connect": self.connect.snapshot().get("new", {"count": 0}),
+        }
+
+
+class _CacheEntry:
+    """A cached GET response and the monotonic time its request started."""
+    __slots__ = ("value", "fetched_at", "refreshing")
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.refreshing = False
+
+
+def _bulk_item_errors(chunk: list[dict], response: Any) -> list[Optional[str]]:
+    """
+    Per-item outcome of a 2xx bulk response: None for an accepted item, else
+    Empire's message. Empire answers 2xx with a list of per-item results
+    ({"item_id" | "id", "success", "message"}); entries are matched to the
+    chunk by id, or by position when the list is as long as the chunk. An
+    item the list doesn't mention is not known to have landed. A response
+    without such a list accepted the chunk whole.
+    """
+    if not isinstance(response, dict):
+        return [None] * len(chunk)
+    if response.get("success") is False:
+        error = str(response.get("message") or response.get("error") or "rejected")
+        return [error] * len(chunk)
+    entries = next((response[key] for key in ("deposits", "items", "data")
+                    if isinstance(response.get(key), list)), None)
+    if entries is None:
+        return [None] * len(chunk)
+    by_id = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            # A deposit answers with the new deposit's "id" and our "item_id";
+            # a price update with the deposit's "id".
+            for key in (entry.get("id"), entry.get("item_id")):
+                if key is not None:
+                    by_id[key] = entry
+    positional = len(entries) == len(chunk)
+    errors: list[Optional[str]] = []
+    for i, item in enumerate(chunk):
+        entry = by_id.get(item.get("id", item.get("asset_id")))
+        if entry is None and positional and isinstance(entries[i], dict):
+            entry = entries[i]
+        if entry is None:
+            errors.append("no result for this item in the response")
+        elif entry.get("success", True) is False:
+            errors.append(str(entry.get("message") or entry.get("error")
+                              or "rejected"))
+        else:
+            errors.append(None)
+    return errors
 
 
 class CSGOEmpireClient:
@@ -178,31 +1036,117 @@ class CSGOEmpireClient:
     The client can also be used without the context manager; the underlying
     aiohttp session is created lazily and should then be closed with
     ``await client.close()``.
+
+    ``adaptive_global=True`` starts at ``max_requests / window`` and probes the
+    global window down towards ADAPTIVE_MIN_WINDOW while it stays 429-free;
+    ``global_limit_estimate`` reports where it currently stands.
+
+    The session keeps a tuned keep-alive pool (``pool_size``, DNS cache) and
+    ``__aenter__`` pre-opens ``warm_connections`` of it; ``keepalive_interval``
+    (opt-in) keeps one warm between requests. ``connection_stats()`` shows
+    how often requests actually reused a connection.
+
+    ``reserved`` / ``weights`` configure the global limiter's per-tier headroom
+    (default GLOBAL_RESERVED) and optional weighted fair sharing, e.g.
+    ``weights={PRIORITY_HIGH: 8, PRIORITY_BID: 4, PRIORITY_NORMAL: 1}``.
+
+    ``hedge_percentile`` (opt-in, e.g. 95) hedges slow GETs: one duplicate is
+    sent once the first attempt outlasts that percentile of the endpoint's
+    recent latency, budget permitting (see HEDGE_MAX_UTILISATION).
+
+    ``state_file`` (opt-in) persists the limiters' used slots and 429 block
+    across restarts (see STATE_SAVE_INTERVAL): they are restored here, saved
+    periodically while the client is entered, after every 429 and at close().
+    One file per API key — two clients must not share one.
+
+    ``shared_limiter`` (opt-in) is an address — a socket path, or
+    "127.0.0.1:PORT" on Windows — through which every process using the same
+    API key shares one set of limiters (see shared_limiter.py); the first
+    process to come up hosts them. Incompatible with ``adaptive_global``.
+
+    ``trace_file`` (opt-in) appends one JSON line per request as it reaches
+    the limiter — time, endpoint, priority, deadline — the trace format
+    ``benchmarks.limiter_sim`` replays against candidate limiter policies.
     """
 
     def __init__(self, api_key: str, *, host: str = DEFAULT_HOST,
                  max_requests: int = 120, window: float = 60.0,
-                 max_retries: int = 3, timeout: float = 30.0):
+                 max_retries: int = 3, timeout: float = 30.0,
+                 adaptive_global: bool = False,
+                 reserved: Optional[dict[int, int]] = None,
+                 weights: Optional[dict[int, float]] = None,
+                 pool_size: int = POOL_SIZE,
+                 warm_connections: int = WARM_CONNECTIONS,
+                 keepalive_interval: Optional[float] = None,
+                 scheme: str = "https",
+                 hedge_percentile: Optional[float] = None,
+                 state_file: Optional[str] = None,
+                 shared_limiter: Optional[str] = None,
+                 trace_file: Optional[str] = None):
         self.api_key = api_key
-        self.base_url = f"https://{host}/api/v2"
+        # scheme="http" is only for local stand-ins (benchmarks/empire_standin).
+        self.origin = f"{scheme}://{host}"
+        self.base_url = f"{self.origin}/api/v2"
         self.max_retries = max_retries
         self._timeout = aiohttp.ClientTimeout(total=timeout)
-        self._limiter = _RateLimiter(max_requests, window)
-        # Tighter buckets for the endpoints Empire rate-limits below the global
-        # cap; a request acquires its endpoint bucket (if any) and the global one.
-        self._endpoint_limiters: dict[str, _RateLimiter] = {
-            key: _RateLimiter(m, w) for key, (m, w) in ENDPOINT_LIMITS.items()
-        }
+        self._limiter = _RateLimiter(
+            max_requests, window,
+            reserved=GLOBAL_RESERVED if reserved is None else reserved,
+            weights=weights)
+        # Opt-in: learn the real global window instead of assuming the slow one.
+        self._adaptive = (_AdaptiveGlobalLimit(self._limiter)
+                          if adaptive_global else None)
+        # Per-endpoint policy, compiled once. Routes with a ``limit`` get a
+        # tighter bucket, acquired together with the global one.
+        self._routes = _RouteTable(ROUTES, timeout=self._timeout,
+                                   max_retries=max_retries)
+        self._endpoint_limiters: dict[str, _RateLimiter] = self._routes.limiters
         self._session: Optional[aiohttp.ClientSession] = None
-        # TEMP(429-bug): rolling log of outgoing requests to count the burst that
-        # trips a 429. Remove once the rate-limit cause is found.
-        self._dbg_calls: deque[tuple[float, str]] = deque()
+        self._pool_size = pool_size
+        self._warm_connections = warm_connections
+        self._keepalive_interval = keepalive_interval
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._last_used = 0.0           # monotonic time of the last request out
+        self._connections = _ConnectionStats()
+        # In-flight GETs by (path, params, body), shared by identical callers.
+        self._inflight: dict[tuple, _Flight] = {}
+        # Cached GET responses: endpoint key -> request key -> entry. The
+        # generation counter per endpoint is bumped on invalidation.
+        self._cache: dict[str, dict[tuple, _CacheEntry]] = {}
+        self._cache_generation: Counter = Counter()
+        self._cache_stats: defaultdict[str, Counter] = defaultdict(Counter)
+        self._background: set[asyncio.Task] = set()
+        # Permanent per-endpoint counters, latency histograms and 429
+        # attribution; query with request_stats().
+        self._ledger = _RequestLedger(self._limiter)
+        self._hedge_percentile = hedge_percentile
+        self._state_file = state_file
+        self._state_task: Optional[asyncio.Task] = None
+        if state_file is not None:
+            self._restore_limiter_state()
+        # Opt-in cross-process budget. The local limiters then only record this
+        # process's own grants (for state_file and for seeding a new host).
+        self._shared = None
+        if shared_limiter is not None:
+            if adaptive_global:
+                raise ValueError("adaptive_global can't drive a shared limiter: "
+                                 "each process would probe the window alone")
+            # Imported here: shared_limiter builds on this module's _RateLimiter.
+            from shared_limiter import SharedLimiter
+            self._shared = SharedLimiter(shared_limiter, self._limiters())
+        self._trace_file = trace_file
+        self._trace = None              # opened on the first request
 
     # ------------------------------------------------------------------ #
     # session lifecycle
     # ------------------------------------------------------------------ #
     async def __aenter__(self) -> "CSGOEmpireClient":
         self._ensure_session()
+        await self.warm_up()
+        if self._keepalive_interval and self._keepalive_task is None:
+            self._keepalive_task = asyncio.ensure_future(self._keepalive_loop())
+        if self._state_file is not None and self._state_task is None:
+            self._state_task = asyncio.ensure_future(self._state_loop())
         return self
 
     async def __aexit__(self, *exc) -> None:
@@ -210,20 +1154,115 @@ class CSGOEmpireClient:
 
     def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size,
+                limit_per_host=self._pool_size,
+                use_dns_cache=True,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
             self._session = aiohttp.ClientSession(
+                connector=connector,
                 timeout=self._timeout,
                 headers={
                     "Accept": "application/json",
                     "Authorization": f"Bearer {self.api_key}",
                 },
+                trace_configs=[self._connections.trace_config()],
             )
         return self._session
 
+    async def warm_up(self, connections: Optional[int] = None) -> None:
+        """
+        Open ``connections`` pooled connections now (DNS, TCP and TLS done up
+        front) with concurrent HEADs on the site root, which is outside the
+        API and so costs no rate-limit slots. Failures are only logged — a cold
+        pool is slower, not broken.
+        """
+        count = self._warm_connections if connections is None else connections
+        if count <= 0:
+            return
+        session = self._ensure_session()
+
+        async def touch() -> None:
+            async with session.head(f"{self.origin}/", allow_redirects=False):
+                pass
+
+        results = await asyncio.gather(*(touch() for _ in range(count)),
+                                       return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            logger.warning(f"[conn] warm-up: {len(errors)}/{count} failed: {errors[0]!r}")
+
+    async def _keepalive_loop(self) -> None:
+        """Touch the pool whenever no request has gone out for
+        ``keepalive_interval`` seconds, so the next bid finds a warm
+        connection instead of one the server has already closed."""
+        while True:
+            idle = time.monotonic() - self._last_used
+            if idle < self._keepalive_interval:
+                await asyncio.sleep(self._keepalive_interval - idle)
+                continue
+            await self.warm_up(1)
+            self._last_used = time.monotonic()
+
+    def connection_stats(self) -> dict[str, Any]:
+        """Connection reuse / setup counters (see _ConnectionStats)."""
+        return self._connections.snapshot()
+
     async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._state_task is not None:
+            self._state_task.cancel()
+            self._state_task = None
+        if self._state_file is not None:
+            self.save_limiter_state()
+        if self._shared is not None:
+            await self._shared.close()
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+        for task in list(self._background):
+            task.cancel()
         if self._session is not None and not self._session.closed:
             await self._session.close()
             self._session = None
 
+    # ------------------------------------------------------------------ #
+    # limiter state across restarts
+    # ------------------------------------------------------------------ #
+    def _limiters(self) -> dict[str, _RateLimiter]:
+        return {"global": self._limiter, **self._endpoint_limiters}
+
+    def save_limiter_state(self) -> None:
+        """Write every limiter's snapshot to ``state_file`` (see
+        _save_limiters)."""
+        _save_limiters(self._state_file, self._limiters())
+
+    def _restore_limiter_state(self) -> None:
+        """Load ``state_file`` (if any) into the limiters, so startup counts
+        the quota the previous process used in the still-open windows."""
+        restored = _load_limiters(self._state_file, self._limiters())
+        if restored is None:
+            return
+        blocked = max(0.0, self._limiter._blocked_until - time.monotonic())
+        logger.info(
+            f"[ratelimit] restored limiter state: {restored} slots still in "
+            f"their windows"
+            + (f", blocked for another {blocked:.0f}s" if blocked else ""))
+
+    async def _state_loop(self) -> None:
+        while True:
+            await asyncio.sleep(STATE_SAVE_INTERVAL)
+            self.save_limiter_state()
+
+    @property
+    def global_limit_estimate(self) -> Optional[dict[str, Any]]:
+        """Current adaptive global-limit estimate, or None when not adaptive."""
+        return self._adaptive.estimate() if self._adaptive is not None else None
+
     # ------------------------------------------------------------------ #
     # core request handling
     # ------------------------------------------------------------------ #
@@ -256,7 +1295,56 @@ class CSGOEmpireClient:
             return
         now = time.time()
         wait = reset - now if reset > now else reset
-        self._limiter.block_for(max(0.0, min(wait, 300.0)))
+        self._block_for(max(0.0, min(wait, 300.0)))
+
+    def _block_for(self, seconds: float) -> None:
+        """Pause the global limiter — every process's, with a shared one: a
+        429 blocks the API key."""
+        self._limiter.block_for(seconds)
+        if self._shared is not None:
+            self._shared.block_for(seconds)
+
+    def _record_trace(self, route: _Route, priority: int,
+                      deadline: Optional[float]) -> None:
+        """Append one request to ``trace_file``; a file that can't be opened
+        turns tracing off (logged), it never fails the request."""
+        if self._trace is None:
+            try:
+                self._trace = open(self._trace_file, "a", buffering=1)
+            except OSError as err:
+                logger.warning(f"[ratelimit] trace disabled: {err}")
+                self._trace_file = None
+                return
+        self._trace.write(_json_dumps({
+            "t": round(time.time(), 3), "endpoint": route.key,
+            "priority": priority,
+            "deadline": (round(deadline - time.monotonic(), 3)
+                         if deadline is not None else None)}) + "\n")
+
+    async def _acquire(self, priority: int, route: _Route,
+                       deadline: Optional[float]) -> None:
+        """Take the route's global and endpoint slots, from the shared limiter
+        if there is one (then recorded locally as this process's share)."""
+        if self._shared is None:
+            await self._limiter.acquire(priority, also=route.also,
+                                        deadline=deadline)
+            return
+        await self._shared.acquire(priority, route.key if route.also else None,
+                                   deadline)
+        self._limiter._record(route.also, time.monotonic())
+
+    async def _take_spare_slot(self, priority: int, route: _Route) -> bool:
+        """A slot for a hedge, only if one is spare (HEDGE_MAX_UTILISATION)."""
+        if self._shared is None:
+            return self._limiter.try_acquire(
+                priority, also=route.also,
+                max_utilisation=HEDGE_MAX_UTILISATION)
+        if not await self._shared.try_acquire(
+                priority, route.key if route.also else None,
+                HEDGE_MAX_UTILISATION):
+            return False
+        self._limiter._record(route.also, time.monotonic())
+        return True
 
     @staticmethod
     def _clean_params(params: Optional[dict]) -> Optional[dict]:
@@ -279,100 +1367,330 @@ class CSGOEmpireClient:
     @staticmethod
     def _endpoint_key(method: str, path: str) -> str:
         """Normalise to "METHOD /path" with numeric ids collapsed to <id>, so
-        /deposit/123/bid and /deposit/456/bid map to the same ENDPOINT_LIMITS key."""
+        /deposit/123/bid and /deposit/456/bid share a key. Only for paths
+        missing from ROUTES (and the stand-in server); requests resolve their
+        key through _RouteTable."""
         return f"{method} {re.sub(r'/\d+', '/<id>', path)}"
 
-    # TEMP(429-bug): request-rate instrumentation. Remove with self._dbg_calls,
-    # the _dbg_record() call in _request, and the _dbg_report_429() call in the
-    # 429 branch once the burst that trips the rate limit is identified.
-    def _dbg_endpoint(self, method: str, path: str) -> str:
-        return self._endpoint_key(method, path)
+    def circuit_stats(self) -> dict[str, dict[str, Any]]:
+        """Circuit breaker state per route that has ever tripped or is not
+        closed (see circuit.py)."""
+        return {key: route.breaker.snapshot()
+                for key, route in self._routes.routes.items()
+                if route.breaker.opened or route.breaker.state != CLOSED}
 
-    def _dbg_record(self, method: str, path: str) -> None:
-        now = time.monotonic()
-        self._dbg_calls.append((now, self._dbg_endpoint(method, path)))
-        cutoff = now - self._limiter.window
-        while self._dbg_calls and self._dbg_calls[0][0] < cutoff:
-            self._dbg_calls.popleft()
-
-    def _dbg_report_429(self, method: str, path: str) -> None:
-        now = time.monotonic()
-        cutoff = now - self._limiter.window
-        recent = [ep for ts, ep in self._dbg_calls if ts >= cutoff]
-        by_ep = Counter(recent).most_common()
-        breakdown = ", ".join(f"{ep}={n}" for ep, n in by_ep)
-        logger.warning(
-            f"[ratelimit-debug] 429 on {method} {path} — "
-            f"{len(recent)} requests this process in trailing "
-            f"{self._limiter.window:.0f}s | {breakdown}")
+    def request_stats(self) -> dict[str, Any]:
+        """Runtime snapshot of the request ledger (see _RequestLedger)."""
+        return self._ledger.snapshot()
 
     async def _request(self, method: str, path: str, *,
                        params: Optional[dict] = None,
                        json: Optional[Any] = None,
                        fail_fast_429: bool = False,
-                       priority: int = PRIORITY_NORMAL) -> Any:
-        url = f"{self.base_url}{path}"
+                       priority: Optional[int] = None,
+                       cache: bool = True,
+                       deadline: Optional[float] = None) -> Any:
+        """
+        Everything about the endpoint (bucket, priority, timeout, retries,
+        cache) comes from its ROUTES entry; ``priority`` overrides the route's.
+
+        deadline: monotonic time after which the request is no longer worth
+        sending; if it is still queued for a rate-limit slot (or backing off
+        between retries) then, DeadlineExceeded is raised without using quota.
+        """
+        route = self._routes.resolve(method, path)
+        if priority is None:
+            priority = route.priority
         params = self._clean_params(params)
+        if method != "GET":
+            result = await self._send(method, route, path, params, json,
+                                      fail_fast_429, priority, deadline)
+            self._invalidate(route)
+            return result
+        if route.cache is not None:
+            if cache:
+                return await self._cached(route, path, params, json, priority)
+            # Bypass the read, but keep the fresh answer for the next caller.
+            return await self._fill(route, self._flight_key(path, params, json),
+                                    path, params, json, priority)
+        return await self._coalesced(route, path, params, json, fail_fast_429,
+                                     priority, deadline)
+
+    # ------------------------------------------------------------------ #
+    # response cache (ROUTES cache / invalidates)
+    # ------------------------------------------------------------------ #
+    async def _cached(self, route: _Route, path: str, params: Optional[dict],
+                      json: Optional[Any], priority: int) -> Any:
+        ttl, stale = route.cache
+        endpoint = route.key
+        key = self._flight_key(path, params, json)
+        stats = self._cache_stats[endpoint]
+        entry = self._cache.get(endpoint, {}).get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < ttl:
+                stats["hit"] += 1
+                return entry.value
+            if age < ttl + stale:
+                stats["stale"] += 1
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    self._revalidate(route, key, path, params, json)
+                return entry.value
+        stats["miss"] += 1
+        return await self._fill(route, key, path, params, json, priority)
+
+    async def _fill(self, route: _Route, key: tuple, path: str,
+                    params: Optional[dict], json: Optional[Any],
+                    priority: int) -> Any:
+        # A write that lands while this GET is in flight bumps the generation,
+        # and the (possibly pre-write) response is then returned but not kept.
+        endpoint = route.key
+        generation = self._cache_generation[endpoint]
+        started = time.monotonic()
+        value = await self._coalesced(route, path, params, json, False, priority)
+        if self._cache_generation[endpoint] == generation:
+            self._cache.setdefault(endpoint, {})[key] = _CacheEntry(value, started)
+        return value
+
+    def _revalidate(self, route: _Route, key: tuple, path: str,
+                    params: Optional[dict], json: Optional[Any]) -> None:
+        task = asyncio.ensure_future(
+            self._fill(route, key, path, params, json, PRIORITY_NORMAL))
+        self._background.add(task)
+        task.add_done_callback(self._revalidated)
+
+    def _revalidated(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"[cache] background refresh failed: {task.exception()}")
+
+    def _invalidate(self, route: _Route) -> None:
+        for target in route.invalidates:
+            self._cache.pop(target, None)
+            self._cache_generation[target] += 1
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Per cached endpoint: fresh ``hit``, ``stale`` (served while
+        refetching) and ``miss`` counts since start — for tuning ROUTES."""
+        return {endpoint: {kind: stats[kind] for kind in ("hit", "stale", "miss")}
+                for endpoint, stats in self._cache_stats.items()}
+
+    @staticmethod
+    def _flight_key(path: str, params: Optional[dict],
+                    json: Optional[Any]) -> tuple:
+        return (path, tuple(sorted(params.items())) if params else (), repr(json))
+
+    async def _coalesced(self, route: _Route, path: str, params: Optional[dict],
+                         json: Optional[Any], fail_fast_429: bool,
+                         priority: int, deadline: Optional[float] = None) -> Any:
+        """
+        Single-flight GET: concurrent identical GETs (same path, params and
+        body) share one HTTP call and one rate-limit slot, and every caller
+        gets the same decoded result — treat it as read-only.
+
+        The call runs in its own task, so one caller being cancelled doesn't
+        fail the others; it is only cancelled once every caller has gone. The
+        first caller's priority and deadline decide where the shared call
+        queues and when it gives up.
+        """
+        key = self._flight_key(path, params, json)
+        flight = self._inflight.get(key)
+        if flight is None:
+            send = self._hedged if self._hedge_percentile else self._send_get
+            task = asyncio.ensure_future(
+                send(route, path, params, json, fail_fast_429, priority,
+                     deadline))
+            flight = self._inflight[key] = _Flight(task)
+            task.add_done_callback(lambda _: self._forget_flight(key, flight))
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Unlist it now, not when the cancellation lands a tick later:
+                # a caller arriving in between must start a new call rather
+                # than join one that is about to raise CancelledError.
+                self._forget_flight(key, flight)
+                flight.task.cancel()
+
+    def _forget_flight(self, key: tuple, flight: _Flight) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    def _send_get(self, route: _Route, path: str, params: Optional[dict],
+                  json: Optional[Any], fail_fast_429: bool, priority: int,
+                  deadline: Optional[float] = None) -> Any:
+        return self._send("GET", route, path, params, json, fail_fast_429,
+                          priority, deadline)
+
+    async def _hedged(self, route: _Route, path: str, params: Optional[dict],
+                      json: Optional[Any], fail_fast_429: bool,
+                      priority: int, deadline: Optional[float] = None) -> Any:
+        """
+        GET with at most one hedge: if the first attempt hasn't answered after
+        ``hedge_percentile`` of the endpoint's recent latency and the budget
+        has spare slots, a duplicate goes out (its slot taken without
+        queueing, never retried). The first success wins and the other attempt
+        is cancelled; if both fail, the first attempt's error is raised.
+        """
+        endpoint = route.key
+        primary = asyncio.ensure_future(self._send_get(
+            route, path, params, json, fail_fast_429, priority, deadline))
+        attempts = [primary]
+        try:
+            delay = (self._ledger.recent_latency(endpoint, self._hedge_percentile)
+                     if route.idempotent else None)
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if (not done and route.breaker.state == CLOSED
+                        and await self._take_spare_slot(priority, route)):
+                    attempts.append(asyncio.ensure_future(self._send(
+                        "GET", route, path, params, json, True, priority,
+                        deadline, hedge=True)))
+                    self._ledger.hedges[endpoint]["sent"] += 1
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._ledger.hedges[endpoint]["won"] += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    async def _send(self, method: str, route: _Route, path: str,
+                    params: Optional[dict], json: Optional[Any],
+                    fail_fast_429: bool, priority: int,
+                    deadline: Optional[float] = None, *,
+                    hedge: bool = False) -> Any:
+        """
+        Send with the route's bucket, timeout and retry policy. A network
+        error or timeout is only retried on idempotent routes: the first
+        attempt may have landed, and a second withdraw or bid must not.
+
+        hedge: the caller already holds this request's slots (taken with
+        ``try_acquire``), so it is sent at once, once — no retries.
+        """
+        url = f"{self.base_url}{path}"
         session = self._ensure_session()
-        endpoint_limiter = self._endpoint_limiters.get(self._endpoint_key(method, path))
+        endpoint = route.key
+        max_retries = 0 if hedge else route.max_retries
+        breaker = route.breaker
         attempt = 0
+        if self._trace_file is not None and not hedge:
+            self._record_trace(route, priority, deadline)
 
         while True:
-            # Acquire the tighter endpoint bucket first, then the global one, so a
-            # request only takes a global slot once its endpoint slot is free.
-            if endpoint_limiter is not None:
-                await endpoint_limiter.acquire(priority)
-            await self._limiter.acquire(priority)
-            self._dbg_record(method, path)  # TEMP(429-bug)
+            ticket = breaker.allow()
+            if ticket is None:
+                raise CircuitOpen(f"Circuit open on {endpoint}: failing fast")
             try:
-                async with session.request(method, url, params=params,
-                                           json=json) as resp:
-                    self._note_rate_headers(resp.headers)
-
-                    if resp.status == 429:
-                        self._dbg_report_429(method, path)  # TEMP(429-bug)
-                        wait = self._retry_after(resp.headers, 60.0)
-                        self._limiter.block_for(wait)
-                        # Time-sensitive callers (bids) raise immediately rather
-                        # than block up to ~60s waiting out the rate limit.
-                        if fail_fast_429 or attempt >= self.max_retries:
+                # Take the endpoint slot and the global slot together, only once
+                # both are free, so a request waiting on the global window never
+                # holds an endpoint slot (e.g. a bid slot) it isn't using yet.
+                queued_at = time.monotonic()
+                if not hedge:
+                    try:
+                        await self._acquire(priority, route, deadline)
+                    except DeadlineExceeded:
+                        self._ledger.record_dropped(endpoint, priority)
+                        raise DeadlineExceeded(
+                            f"Deadline exceeded waiting for a slot on {method} {path}"
+                        ) from None
+                sent_at = self._last_used = time.monotonic()
+                self._ledger.record_sent(endpoint, priority, sent_at - queued_at)
+                try:
+                    async with session.request(method, url, params=params, json=json,
+                                               timeout=route.timeout) as resp:
+                        self._note_rate_headers(resp.headers)
+
+                        if resp.status == 429:
+                            self._ledger.record_response(
+                                endpoint, 429, time.monotonic() - sent_at)
+                            recent = self._ledger.report_429(endpoint, method, path)
+                            wait = self._retry_after(resp.headers, 60.0)
+                            self._block_for(wait)
+                            if self._adaptive is not None:
+                                self._adaptive.on_429(recent)
+                            if self._state_file is not None:
+                                self.save_limiter_state()
+                            # Time-sensitive callers (bids) raise immediately
+                            # rather than block up to ~60s waiting out the limit.
+                            if fail_fast_429 or attempt >= max_retries:
+                                raise CSGOEmpireError(
+                                    f"Rate limited on {method} {path}",
+                                    status=429)
+                            attempt += 1
+                            await self._backoff(wait, deadline, method, path)
+                            continue
+
+                        if resp.status >= 500:
+                            self._ledger.record_response(
+                                endpoint, resp.status, time.monotonic() - sent_at)
+                            breaker.failure()
+                            # An opened circuit ends the retry ladder too.
+                            if attempt >= max_retries or breaker.state != CLOSED:
+                                text = await resp.text()
+                                raise CSGOEmpireError(
+                                    f"Server error {resp.status} on {method} {path}",
+                                    status=resp.status, payload=text)
+                            attempt += 1
+                            await self._backoff(2 ** attempt, deadline, method, path)
+                            continue
+
+                        breaker.success()
+                        if self._adaptive is not None:
+                            self._adaptive.on_success()
+                        data = await self._parse(resp)
+                        self._ledger.record_response(
+                            endpoint, resp.status, time.monotonic() - sent_at)
+                        if resp.status >= 400:
                             raise CSGOEmpireError(
-                                f"Rate limited on {method} {path}",
-                                status=429)
-                        attempt += 1
-                        await asyncio.sleep(wait)
-                        continue
-
-                    if resp.status >= 500:
-                        if attempt >= self.max_retries:
-                            text = await resp.text()
-                            raise CSGOEmpireError(
-                                f"Server error {resp.status} on {method} {path}",
-                                status=resp.status, payload=text)
-                        attempt += 1
-                        await asyncio.sleep(2 ** attempt)
-                        continue
-
-                    data = await self._parse(resp)
-                    if resp.status >= 400:
+                                f"HTTP {resp.status} on {method} {path}",
+                                status=resp.status, payload=data)
+                        return data
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    self._ledger.record_response(endpoint, 0, time.monotonic() - sent_at)
+                    breaker.failure()
+                    if (attempt >= max_retries or not route.idempotent
+                            or breaker.state != CLOSED):
                         raise CSGOEmpireError(
-                            f"HTTP {resp.status} on {method} {path}",
-                            status=resp.status, payload=data)
-                    return data
+                            f"Network error on {method} {path}: {err}") from err
+                    attempt += 1
+                    await self._backoff(2 ** attempt, deadline, method, path)
+            finally:
+                breaker.release(ticket)
 
-            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-                if attempt >= self.max_retries:
-                    raise CSGOEmpireError(
-                        f"Network error on {method} {path}: {err}") from err
-                attempt += 1
-                await asyncio.sleep(2 ** attempt)
+    @staticmethod
+    async def _backoff(seconds: float, deadline: Optional[float],
+                       method: str, path: str) -> None:
+        """Sleep before a retry, unless the retry would land past the deadline."""
+        if deadline is not None and time.monotonic() + seconds > deadline:
+            raise DeadlineExceeded(
+                f"Deadline exceeded before retrying {method} {path}")
+        await asyncio.sleep(seconds)
 
     @staticmethod
     async def _parse(resp: aiohttp.ClientResponse) -> Any:
-        try:
-            return await resp.json()
-        except (aiohttp.ContentTypeError, ValueError):
-            return await resp.text()
+        """Decode the body read once as raw bytes: JSON straight from bytes
+        (json_loads, no intermediate str), text for non-JSON or bad JSON."""
+        body = await resp.read()
+        if "json" in resp.content_type:
+            if not body.strip():
+                return None
+            try:
+                return json_loads(body)
+            except ValueError:
+                pass
+        return body.decode(resp.charset or "utf-8", errors="replace")
 
     # ------------------------------------------------------------------ #
     # value helpers
@@ -398,16 +1716,28 @@ class CSGOEmpireClient:
     # ------------------------------------------------------------------ #
     # metadata
     # ------------------------------------------------------------------ #
-    async def get_metadata(self) -> Any:
-        """GET /metadata/socket — account + socket auth metadata."""
-        return await self._request("GET", "/metadata/socket")
+    async def get_metadata(self, *, fresh: bool = False) -> Any:
+        """
+        GET /metadata/socket — account + socket auth metadata.
+
+        Cached briefly (ROUTES); fresh=True skips the cache, for callers
+        that know the balance just changed.
+        """
+        return await self._request("GET", "/metadata/socket", cache=not fresh)
 
     # ------------------------------------------------------------------ #
     # trading automation
     # ------------------------------------------------------------------ #
-    async def get_automation_status(self) -> Any:
-        """GET /trading/automation/status"""
-        return await self._request("GET", "/trading/automation/status")
+    async def get_automation_status(self, *, fresh: bool = False) -> Any:
+        """
+        GET /trading/automation/status
+
+        Cached briefly (ROUTES), never served stale: the token expiry in it
+        decides when to refresh. fresh=True skips the cache, for callers that
+        waited for that expiry.
+        """
+        return await self._request("GET", "/trading/automation/status",
+                                   cache=not fresh)
 
     async def update_access_token(self, access_token: str) -> Any:
         """PUT /trading/automation/access-token"""
@@ -457,6 +1787,14 @@ class CSGOEmpireClient:
         return await self._request("POST", "/trading/deposit",
                                    json={"items": items})
 
+    async def create_deposits(self, items: list[dict]) -> dict[str, Any]:
+        """
+        ``create_deposit`` for any number of items: chunked to BULK_MAX_ITEMS
+        and sent concurrently (paced by the global and POST /trading/deposit
+        buckets). Returns a merged report — see ``_bulk``.
+        """
+        return await self._bulk(self.create_deposit, items)
+
     async def cancel_deposit(self, deposit_id: int) -> Any:
         """POST /trading/deposit/{deposit_id}/cancel"""
         return await self._request(
@@ -485,23 +1823,22 @@ class CSGOEmpireClient:
     async def mark_as_received(self, tradeoffer_id: int) -> Any:
         """POST /trading/deposit/{tradeoffer_id}/received"""
         return await self._request(
-            "POST", f"/trading/deposit/{tradeoffer_id}/received",
-            priority=PRIORITY_HIGH)
+            "POST", f"/trading/deposit/{tradeoffer_id}/received")
 
     async def dispute_trade(self, tradeoffer_id: int) -> Any:
         """POST /trading/deposit/{tradeoffer_id}/dispute"""
         return await self._request(
-            "POST", f"/trading/deposit/{tradeoffer_id}/dispute",
-            priority=PRIORITY_HIGH)
+            "POST", f"/trading/deposit/{tradeoffer_id}/dispute")
 
     async def create_withdrawal(self, deposit_id: int, coin_value: int) -> Any:
         """POST /trading/deposit/{deposit_id}/withdraw — buy/withdraw an item."""
         return await self._request(
             "POST", f"/trading/deposit/{deposit_id}/withdraw",
-            json={"coin_value": coin_value}, priority=PRIORITY_HIGH)
+            json={"coin_value": coin_value})
 
     async def place_bid(self, deposit_id: int, bid_value: int, *,
-                        fail_fast_429: bool = False) -> Any:
+                        fail_fast_429: bool = False,
+                        deadline: Optional[float] = None) -> Any:
         """
         POST /trading/deposit/{deposit_id}/bid
 
@@ -511,13 +1848,17 @@ class CSGOEmpireClient:
         fail_fast_429: raise immediately on 429 instead of waiting out the rate
         limit — auctions are time-sensitive, so a 60s wait wins nothing.
 
+        deadline: monotonic time past which the bid can no longer win (auction
+        over, or queued so long the price has moved). If no rate-limit slot is
+        free by then, DeadlineExceeded is raised and no quota is spent.
+
         Bids run at PRIORITY_BID: they jump ahead of background polling but yield
         to TradeBot's money actions when the shared rate-limit window is saturated.
         """
         return await self._request(
             "POST", f"/trading/deposit/{deposit_id}/bid",
             json={"bid_value": bid_value}, fail_fast_429=fail_fast_429,
-            priority=PRIORITY_BID)
+            deadline=deadline)
 
     async def get_depositor_stats(self, deposit_id: int) -> Any:
         """GET /trading/deposit/{deposit_id}/stats"""
@@ -543,6 +1884,60 @@ class CSGOEmpireClient:
         return await self._request("PATCH", "/trading/deposit/bulk",
                                    json={"items": items})
 
+    async def bulk_update_listing_prices_all(self, items: list[dict]
+                                             ) -> dict[str, Any]:
+        """
+        ``bulk_update_listing_prices`` for any number of items: chunked to
+        BULK_MAX_ITEMS and sent concurrently within the global budget. Returns
+        a merged report — see ``_bulk``.
+        """
+        return await self._bulk(self.bulk_update_listing_prices, items)
+
+    @staticmethod
+    async def _bulk(send: Callable[[list[dict]], Any],
+                    items: list[dict]) -> dict[str, Any]:
+        """
+        Send ``items`` in BULK_MAX_ITEMS chunks concurrently; the rate limiters
+        pace the chunks, so this is as fast as the budget allows and no
+        faster. One failed chunk doesn't fail the rest. Report:
+
+            sent:      items Empire accepted
+            failed:    [{"item", "error", "status"}] for items of failed chunks
+                       and items a 2xx chunk reported as failed (status None)
+            responses: raw response of each 2xx chunk, in chunk order
+
+        Any other exception from a chunk raises BulkError once every chunk
+        is done, carrying the report so what landed isn't lost.
+        """
+        chunks = [items[i:i + BULK_MAX_ITEMS]
+                  for i in range(0, len(items), BULK_MAX_ITEMS)]
+        results = await asyncio.gather(*(send(chunk) for chunk in chunks),
+                                       return_exceptions=True)
+        report: dict[str, Any] = {"sent": [], "failed": [], "responses": []}
+        unexpected: Optional[BaseException] = None
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, CSGOEmpireError):
+                report["failed"].extend(
+                    {"item": item, "error": str(result), "status": result.status}
+                    for item in chunk)
+            elif isinstance(result, BaseException):
+                unexpected = unexpected or result
+                report["failed"].extend(
+                    {"item": item, "error": repr(result), "status": None}
+                    for item in chunk)
+            else:
+                report["responses"].append(result)
+                for item, error in zip(chunk, _bulk_item_errors(chunk, result)):
+                    if error is None:
+                        report["sent"].append(item)
+                    else:
+                        report["failed"].append(
+                            {"item": item, "error": error, "status": None})
+        if unexpected is not None:
+            raise BulkError(f"Bulk request failed: {unexpected!r}",
+                            report) from unexpected
+        return report
+
     async def get_listed_items(self, *, per_page: int, page: int,
                                **filters: Any) -> Any:
         """
@@ -556,6 +1951,69 @@ class CSGOEmpireClient:
         params = {"per_page": per_page, "page": page, **filters}
         return await self._request("GET", "/trading/items", params=params)
 
+    async def iter_listed_items(self, *, per_page: int = 2500, start_page: int = 1,
+                                prefetch: int = 1, budget_share: float = 0.25,
+                                until: Optional[Callable[[dict], bool]] = None,
+                                **filters: Any) -> AsyncIterator[dict]:
+        """
+        Stream marketplace items across pages of ``get_listed_items``.
+
+        Up to ``prefetch`` further pages are fetched concurrently while the
+        caller works through the current one, so at most ``prefetch + 1``
+        pages are held at once however many there are. Page fetches draw on a
+        private budget of ``budget_share`` of the global window (e.g. 30 of 120
+        slots per 60s at 0.25); once it is spent they wait for it rather than
+        crowd out bids and TradeBot. Iteration ends after the last (short or
+        empty) page, or at the first item for which ``until(item)`` is true —
+        that item is not yielded. Wrap in ``contextlib.aclosing`` when breaking
+        out early, so pending prefetches are cancelled promptly.
+        """
+        budget = _RateLimiter(max(1, int(self._limiter.max_requests * budget_share)),
+                              self._limiter.window)
+        pending: deque[asyncio.Task] = deque()
+        next_page = start_page
+        last_page: Optional[int] = None
+
+        async def fetch(page: int) -> Any:
+            await budget.acquire()
+            return await self.get_listed_items(per_page=per_page, page=page,
+                                               **filters)
+
+        def top_up(limit: int) -> None:
+            nonlocal next_page
+            while (len(pending) < limit
+                   and (last_page is None or next_page <= last_page)):
+                pending.append(asyncio.ensure_future(fetch(next_page)))
+                next_page += 1
+
+        try:
+            top_up(max(1, prefetch))    # the first page, plus prefetches
+            while pending:
+                resp = await pending.popleft()
+                items = (resp.get("data") or []) if isinstance(resp, dict) else []
+                if isinstance(resp, dict) and resp.get("last_page") is not None:
+                    last_page = int(resp["last_page"])
+                short = len(items) < per_page
+                if short:
+                    # Short page: this is the end; prefetches past it are waste.
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                else:
+                    # Held now: this page and up to ``prefetch`` in flight.
+                    top_up(prefetch)
+                resp = None
+                for item in items:
+                    if until is not None and until(item):
+                        return
+                    yield item
+                if not short:
+                    # Without prefetch the next page is only asked for now.
+                    top_up(1)
+        finally:
+            for task in pending:
+                task.cancel()
+
     # ------------------------------------------------------------------ #
     # inventory
     # ------------------------------------------------------------------ #
@@ -1,5 +1,6 @@
 from logger import logger
 import asyncio
+from datetime import datetime
 
 import pyodbc
 
@@ -137,6 +138,22 @@ class DB:
         row = await self._execute(query, (market_hash_name,), fetch="one")
         return tuple(row) if row else None
 
+    async def get_item_prices(self, since: datetime | None = None) -> list[tuple]:
+        """Every tracked item as ``(market_hash_name, price_empire,
+        price_updated_at)`` — or, with ``since`` (naive UTC), only rows
+        refreshed at or after it. Feeds the bidder's PriceIndex; same
+        semantics per row as ``get_item_price``."""
+        query = (
+            "SELECT i.market_hash_name, ip.price_empire, ip.price_updated_at "
+            "FROM item_prices ip JOIN items i ON ip.item_id = i.id"
+        )
+        if since is None:
+            rows = await self._execute(query, fetch="all")
+        else:
+            rows = await self._execute(query + " WHERE ip.price_updated_at >= ?",
+                                       (since,), fetch="all")
+        return [tuple(row) for row in rows]
+
     async def update_items_prices(self, id: int, price_empire: float,
                                   price_float: float) -> None:
         query = (
@@ -63,6 +63,8 @@ _TAG_COLORS: dict[str, str] = {
     "filters":  BLUE,
     "telegram": GREY,
     "ws":       GREY_DARK,
+    "conn":     GREY_DARK,
+    "circuit":  YELLOW,
     "token":    BLUE,
     "skip":     GREY_DARK,
 }
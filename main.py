@@ -50,8 +50,14 @@ async def run_all(run_bidder: bool):
                                steam_guard=steam_guard_path)
 
     # One CSGOEmpireClient for TradeBot and BiddingBot -> one shared rate-limit
-    # window (bids get priority over polling inside it).
-    async with CSGOEmpireClient(bearer_auth) as empire, \
+    # window (bids get priority over polling inside it), carried across restarts
+    # in a per-user state file. Other processes on the same key (scripts, a
+    # second bidder) join it through empire.shared_limiter, if configured.
+    empire_state = os.path.join("state", f"empire_ratelimit_{username}.json")
+    async with CSGOEmpireClient(bearer_auth, keepalive_interval=30.0,
+                                state_file=empire_state,
+                                shared_limiter=user["empire"].get("shared_limiter")
+                                ) as empire, \
             CSFloatClient(api_key_float) as csfloat:
         bot = TradeBot(steam=steam_client, empire=empire, db=db,
                        telegram=telegram, divider=divider)
@@ -66,7 +72,8 @@ async def run_all(run_bidder: bool):
             await asyncio.gather(*tasks)
             return
 
-        bidder = BiddingBot(empire=empire, db=db)
+        bidder = BiddingBot(empire=empire, db=db,
+                            latency_file=os.path.join("logs", f"bid_latency_{username}.jsonl"))
         bidder_task = asyncio.ensure_future(bidder.run())
         tasks.append(bidder_task)
 
@@ -0,0 +1,178 @@
+"""
+Fixed-memory latency instrumentation shared by the clients and bots.
+
+Everything here is O(1) per observation and bounded in memory no matter how
+long the process runs: a ``Histogram`` is a fixed array of log-spaced buckets,
+and raw samples (where kept) live in a ring buffer. Snapshots are plain dicts
+so they can be logged or dumped as JSON as-is.
+
+``StageLatency`` times one operation across layers that don't call each other
+directly (bidder -> client -> limiter): the caller puts a ``Trace`` in
+``current_trace`` and every layer reports its stage to whatever trace is
+current, if any — one ContextVar read when nothing is being traced.
+"""
+
+import bisect
+import json
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Iterable, Optional
+
+# Bucket upper bounds in seconds: 0.5 ms doubling up to ~4.4 min. Anything
+# slower lands in the overflow bucket.
+DEFAULT_BOUNDS: tuple[float, ...] = tuple(0.0005 * 2 ** i for i in range(20))
+
+
+class Histogram:
+    """Count / sum / max plus bucketed distribution of durations in seconds."""
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the ``pct``-th percentile, capped
+        at the observed max; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1e3, 2),
+            "p50_ms": round(self.percentile(50) * 1e3, 2),
+            "p90_ms": round(self.percentile(90) * 1e3, 2),
+            "p99_ms": round(self.percentile(99) * 1e3, 2),
+            "max_ms": round(self.max * 1e3, 2),
+        }
+
+
+class HistogramSet:
+    """Histograms keyed by a label (endpoint, priority, stage, ...), created on
+    first use. Labels come from small fixed sets, so memory stays bounded."""
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BOUNDS):
+        self._bounds = tuple(bounds)
+        self._by_label: dict[Any, Histogram] = {}
+
+    def observe(self, label: Any, seconds: float) -> None:
+        hist = self._by_label.get(label)
+        if hist is None:
+            hist = self._by_label[label] = Histogram(self._bounds)
+        hist.observe(seconds)
+
+    def get(self, label: Any) -> Optional[Histogram]:
+        return self._by_label.get(label)
+
+    def items(self) -> Iterable[tuple[Any, Histogram]]:
+        return self._by_label.items()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {str(label): hist.snapshot()
+                for label, hist in sorted(self._by_label.items(),
+                                          key=lambda kv: str(kv[0]))}
+
+
+class RingBuffer(deque):
+    """A deque that keeps only the newest ``size`` items."""
+
+    def __init__(self, size: int):
+        super().__init__(maxlen=size)
+
+
+class StageLatency:
+    """
+    Per-stage timings of one kind of operation, by tag (e.g. the websocket
+    event that started it): a histogram per ``(tag, stage)`` plus the newest
+    ``samples`` raw ``(time, tag, stage, seconds)`` observations, for
+    comparing runs beyond what the buckets resolve.
+    """
+
+    def __init__(self, samples: int = 4096):
+        self.histograms = HistogramSet()
+        self.samples = RingBuffer(samples)
+
+    def observe(self, tag: str, stage: str, seconds: float) -> None:
+        self.histograms.observe((tag, stage), seconds)
+        self.samples.append((time.time(), tag, stage, seconds))
+
+    def trace(self, tag: str, started: Optional[float] = None) -> "Trace":
+        """A trace for one operation that began at ``started`` (monotonic,
+        default now)."""
+        return Trace(self, tag, time.monotonic() if started is None else started)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """``{tag: {stage: histogram snapshot}}``."""
+        out: dict[str, dict[str, Any]] = {}
+        for (tag, stage), hist in self.histograms.items():
+            out.setdefault(tag, {})[stage] = hist.snapshot()
+        return out
+
+    def summary(self, stages: Iterable[str]) -> list[str]:
+        """One ``tag n=... stage p50/p99 ms ...`` line per tag, ``stages`` in
+        order (missing ones skipped)."""
+        lines = []
+        for tag, by_stage in sorted(self.snapshot().items()):
+            parts = [f"{stage} {by_stage[stage]['p50_ms']:.1f}/"
+                     f"{by_stage[stage]['p99_ms']:.1f}"
+                     for stage in stages if by_stage.get(stage, {}).get("count")]
+            count = max(h["count"] for h in by_stage.values())
+            lines.append(f"{tag} n={count} p50/p99 ms: " + ", ".join(parts))
+        return lines
+
+    def dump(self, path: str) -> int:
+        """Write the raw samples as JSON lines ``{"t", "tag", "stage", "ms"}``;
+        returns how many."""
+        samples = list(self.samples)
+        with open(path, "w") as file:
+            file.writelines(
+                json.dumps({"t": round(t, 3), "tag": tag, "stage": stage,
+                            "ms": round(seconds * 1e3, 3)}) + "\n"
+                for t, tag, stage, seconds in samples)
+        return len(samples)
+
+
+class Trace:
+    """One traced operation: stages report into its StageLatency under its
+    tag; ``finish()`` records the end-to-end ``total`` once."""
+    __slots__ = ("sink", "tag", "started", "finished")
+
+    def __init__(self, sink: StageLatency, tag: str, started: float):
+        self.sink = sink
+        self.tag = tag
+        self.started = started
+        self.finished = False
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.sink.observe(self.tag, stage, seconds)
+
+    def finish(self) -> None:
+        if not self.finished:
+            self.finished = True
+            self.sink.observe(self.tag, "total", time.monotonic() - self.started)
+
+
+# The trace the running task's work belongs to, if any (see StageLatency).
+# Tasks copy the context when created, so each gathered handler has its own.
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
@@ -0,0 +1,142 @@
+"""
+In-process copy of ``item_prices`` for the bidder's hot path.
+
+BiddingBot needs our valuation for every item the websocket pushes, and the
+``init`` / ``new_item`` bursts carry up to 2500 of them at once. Asking the DB
+per item means one round trip each through DB's single locked connection (shared
+with PriceService), so a burst queues thousands of serialised queries before the
+first bid can go out. Instead the whole table (a few dozen rows) is loaded once
+and kept current in the background:
+
+    reload    full ``items JOIN item_prices`` snapshot at startup and every
+              RELOAD_INTERVAL (picks up deleted items and never-priced rows)
+    refresh   every REFRESH_INTERVAL, only rows whose ``price_updated_at`` is at
+              or past the watermark (the newest timestamp seen, minus
+              WATERMARK_OVERLAP so rows committed late aren't skipped)
+
+The snapshot is authoritative, so a name that isn't in it is the negative answer
+("untracked"): it costs a dict miss, never a query. ``lookup`` returns exactly
+what ``DB.get_item_price`` would have (``(price_empire, price_updated_at)`` or
+None), so freshness is still judged by the caller against price_updated_at —
+the index can only lag the DB by REFRESH_INTERVAL, and a lagging index holds
+older timestamps, never newer ones, so it cannot make a stale price look fresh.
+
+Entries are also addressable by position (``positions`` / ``names`` /
+``rows``) so a whole websocket batch can be evaluated as columns; a refresh
+updates rows in place and appends new names, so positions only change on a
+reload.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from logger import logger
+from db import DB, DBError
+
+REFRESH_INTERVAL = 5.0
+RELOAD_INTERVAL = 10 * 60
+# price_updated_at is SYSUTCDATETIME() at UPDATE time, committed just after;
+# re-reading this much history per refresh is a handful of rows and covers any
+# update that committed after a refresh had already read past its timestamp.
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+class PriceIndex:
+    """``market_hash_name -> (price_empire, price_updated_at)`` for every
+    tracked item; ``price_updated_at`` is naive UTC and may be None."""
+
+    def __init__(self, db: DB):
+        self.db = db
+        self._positions: dict[str, int] = {}
+        self._names: list[str] = []
+        self._rows: list[tuple] = []    # (price_empire, price_updated_at)
+        self._watermark: Optional[datetime] = None
+        self._reloaded_at = 0.0     # monotonic; 0 = never loaded
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._reloaded_at > 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def positions(self) -> dict[str, int]:
+        """``market_hash_name -> position`` in ``names`` / ``rows``."""
+        return self._positions
+
+    @property
+    def names(self) -> list[str]:
+        return self._names
+
+    @property
+    def rows(self) -> list[tuple]:
+        return self._rows
+
+    def lookup(self, market_hash_name: str) -> tuple | None:
+        """Same contract as ``DB.get_item_price``, from memory."""
+        position = self._positions.get(market_hash_name)
+        if position is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._rows[position]
+
+    # ------------------------------------------------------------------ #
+    # loading
+    # ------------------------------------------------------------------ #
+    async def reload(self) -> None:
+        """Replace the index with a full snapshot. Raises DBError."""
+        rows = await self.db.get_item_prices()
+        self._positions, self._names, self._rows = {}, [], []
+        self._apply(rows)
+        self._watermark = self._newest(rows, None)
+        self._reloaded_at = time.monotonic()
+        logger.info(f"[prices] index loaded — {len(self._rows)} items")
+
+    async def refresh(self) -> int:
+        """Apply rows updated since the watermark; returns how many. Raises
+        DBError."""
+        if self._watermark is None:
+            # Nothing timestamped yet: only a reload can find new rows.
+            await self.reload()
+            return len(self._rows)
+        rows = await self.db.get_item_prices(since=self._watermark - WATERMARK_OVERLAP)
+        self._apply(rows)
+        self._watermark = self._newest(rows, self._watermark)
+        return len(rows)
+
+    def _apply(self, rows: list[tuple]) -> None:
+        for name, price, updated_at in rows:
+            position = self._positions.get(name)
+            if position is None:
+                self._positions[name] = len(self._rows)
+                self._names.append(name)
+                self._rows.append((price, updated_at))
+            else:
+                self._rows[position] = (price, updated_at)
+
+    @staticmethod
+    def _newest(rows: list[tuple], watermark: Optional[datetime]) -> Optional[datetime]:
+        for _, _, updated_at in rows:
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        return watermark
+
+    async def run(self) -> None:
+        """Keep the index current until cancelled. DB errors keep the old
+        entries: their timestamps keep ageing, so the caller's age check
+        stops bidding on them exactly as it would with a stalled PriceService."""
+        while True:
+            await asyncio.sleep(REFRESH_INTERVAL)
+            try:
+                if time.monotonic() - self._reloaded_at >= RELOAD_INTERVAL:
+                    await self.reload()
+                else:
+                    await self.refresh()
+            except DBError as e:
+                logger.error(f"[prices] index refresh failed: {e}")
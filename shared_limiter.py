@@ -0,0 +1,506 @@
+"""
+Cross-process rate limiting for one Empire API key.
+
+Empire's budget (the global window, the per-endpoint buckets, the 60s block
+after a 429) belongs to the API key, but a ``_RateLimiter`` only sees its own
+process: a reporting script, a second bidder or a manual tool running next to
+main.py would double the request rate without either process knowing. With
+``CSGOEmpireClient(shared_limiter=ADDRESS)`` every process on the host that
+names the same ADDRESS draws on one set of limiters:
+
+    ADDRESS   a filesystem path, served as a Unix socket (e.g.
+              "state/empire_ratelimit.sock"), or "127.0.0.1:PORT" for loopback
+              TCP where Unix sockets aren't available (Windows)
+
+The limiters live in one *host* process; the others ask it for slots over the
+socket, one JSON message per line. The host is whichever client gets there
+first — the one holding ADDRESS.lock (Unix socket) or bound to the port (TCP)
+— or a dedicated ``python -m shared_limiter ADDRESS``. It runs the ordinary
+_RateLimiter scheduler, so priority order, reserved slots, weights, deadlines
+and the 429 block hold across processes as they do within one: a money action
+queued in one process is served before a bid queued in another.
+
+When the host goes away the other clients elect a new one and re-send
+whatever they still had queued. The new host starts from the snapshot its
+predecessor kept next to the socket (ADDRESS.state, rewritten at most every
+HOST_SAVE_INTERVAL while slots are being granted) plus each client's record of
+its own grants (the local limiters ``state_file`` saves). Grants can be
+counted twice that way, never forgotten — bar the last HOST_SAVE_INTERVAL of
+a host killed outright — so a failover errs towards a slower window, not a
+429.
+
+time.monotonic() is one host-wide clock on Linux, macOS and Windows, so
+deadlines and grant times cross the socket unchanged.
+
+Protocol (client -> host; the host answers requests carrying an "id" with
+{"id", "at": grant time} or {"id", "error": "deadline" | "refused" |
+"cancelled"}):
+
+    {"op": "acquire", "id", "priority", "bucket", "deadline"}
+    {"op": "try", "id", "priority", "bucket", "max_utilisation"}
+    {"op": "cancel", "id"}               give up a queued acquire
+    {"op": "refund", "bucket", "at"}     return a grant that arrived too late
+    {"op": "block", "seconds"}           429 / out-of-quota pause, for everyone
+    {"op": "restore", "limiters"}        seed a new host (_RateLimiter.snapshot)
+
+"bucket" is the endpoint limiter's key in ROUTES, or null for global-only.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from contextlib import suppress
+from typing import Any, Optional
+
+from csgoempire_client import (GLOBAL_RESERVED, ROUTES, CSGOEmpireError,
+                               DeadlineExceeded, _load_limiters, _RateLimiter,
+                               _save_limiters)
+from logger import logger
+
+try:
+    import fcntl
+except ImportError:                 # Windows: TCP addresses only
+    fcntl = None
+
+# Pause between election attempts while another client is taking over as host.
+ELECTION_RETRY = 0.05
+
+# The host's snapshot for its successor is rewritten at most this often.
+HOST_SAVE_INTERVAL = 0.5
+
+
+def _tcp_address(address: str) -> Optional[tuple[str, int]]:
+    """("127.0.0.1", 47120) for "127.0.0.1:47120", None for a socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return None
+
+
+def _state_path(address: str) -> str:
+    tcp = _tcp_address(address)
+    if tcp is None:
+        return f"{address}.state"
+    return os.path.join(tempfile.gettempdir(),
+                        f"empire_shared_limiter_{tcp[1]}.state")
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class LimiterHost:
+    """
+    The shared limiters and the server handing them out. Built as copies of
+    ``templates`` (the hosting client's own limiters: same limits, reserved
+    slots and weights), so every process should run the same configuration —
+    the host's is the one that counts.
+    """
+
+    def __init__(self, templates: dict[str, _RateLimiter]):
+        self.limiters = {
+            name: _RateLimiter(limiter.max_requests, limiter.window,
+                               reserved=limiter._reserved,
+                               weights=limiter._weights)
+            for name, limiter in templates.items()}
+        self._global = self.limiters["global"]
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._lock_file = None
+        self._address: Optional[str] = None
+        self._state_path: Optional[str] = None
+        self._save_timer: Optional[asyncio.TimerHandle] = None
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, address: str) -> None:
+        """Serve on ``address``, picking up the previous host's snapshot;
+        OSError if another host already serves it."""
+        await self._bind(address)
+        self._state_path = _state_path(address)
+        restored = _load_limiters(self._state_path, self.limiters)
+        if restored:
+            logger.info(f"[ratelimit] shared limiter: took over {restored} "
+                        f"slots from the previous host")
+
+    async def _bind(self, address: str) -> None:
+        tcp = _tcp_address(address)
+        if tcp is not None:
+            self._server = await asyncio.start_server(self._serve, *tcp)
+            return
+        directory = os.path.dirname(address)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(f"{address}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # Holding the lock makes any socket file left behind a dead host's.
+            with suppress(FileNotFoundError):
+                os.unlink(address)
+            self._server = await asyncio.start_unix_server(self._serve, address)
+        except BaseException:
+            lock_file.close()
+            raise
+        self._lock_file = lock_file
+        self._address = address
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for writer in self._connections.values():
+            writer.close()
+        # Let the handlers see EOF and cancel their clients' queued acquires.
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=1.0)
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save()
+        if self._lock_file is not None:
+            # Unlink before unlocking: the next host must not lose its socket.
+            with suppress(OSError):
+                os.unlink(self._address)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _changed(self) -> None:
+        """Slots were granted or a block set: save for a successor soon."""
+        if self._save_timer is None and self._state_path is not None:
+            self._save_timer = asyncio.get_running_loop().call_later(
+                HOST_SAVE_INTERVAL, self._save)
+
+    def _save(self) -> None:
+        self._save_timer = None
+        _save_limiters(self._state_path, self.limiters)
+
+    def _also(self, bucket: Optional[str]) -> tuple[_RateLimiter, ...]:
+        limiter = self.limiters.get(bucket) if bucket is not None else None
+        return (limiter,) if limiter is not None else ()
+
+    async def answer(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Serve one acquire / try request; the reply as sent on the wire."""
+        request = message.get("id")
+        also = self._also(message.get("bucket"))
+        if message["op"] == "try":
+            if not self._global.try_acquire(
+                    message["priority"], also=also,
+                    max_utilisation=message["max_utilisation"]):
+                return {"id": request, "error": "refused"}
+            self._changed()
+            return {"id": request, "at": self._global._timestamps[-1]}
+        try:
+            at = await self._global.acquire(message["priority"], also=also,
+                                            deadline=message.get("deadline"))
+        except DeadlineExceeded:
+            return {"id": request, "error": "deadline"}
+        self._changed()
+        return {"id": request, "at": at}
+
+    def handle(self, message: dict[str, Any]) -> None:
+        """Apply one of the unanswered ops (refund, block, restore)."""
+        op = message["op"]
+        if op == "refund":
+            for limiter in (self._global, *self._also(message.get("bucket"))):
+                limiter._refund(message["at"])
+            self._global._schedule()
+        elif op == "block":
+            self._global.block_for(message["seconds"])
+            self._changed()
+        elif op == "restore":
+            for name, snapshot in message["limiters"].items():
+                limiter = self.limiters.get(name)
+                if limiter is not None:
+                    limiter.restore(snapshot)
+
+    async def _serve(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """One client connection: requests are answered concurrently, in
+        whatever order the scheduler grants them."""
+        self._connections[asyncio.current_task()] = writer
+        tasks: dict[int, asyncio.Task] = {}
+
+        def reply(request: int, task: asyncio.Task) -> None:
+            tasks.pop(request, None)
+            if task.cancelled():
+                message = {"id": request, "error": "cancelled"}
+            elif task.exception() is not None:
+                logger.error(f"[ratelimit] shared limiter: {task.exception()!r}")
+                message = {"id": request, "error": "cancelled"}
+            else:
+                message = task.result()
+            if not writer.is_closing():
+                writer.write(_encode(message))
+
+        try:
+            async for line in reader:
+                message = json.loads(line)
+                op = message["op"]
+                if op in ("acquire", "try"):
+                    request = message["id"]
+                    task = asyncio.ensure_future(self.answer(message))
+                    tasks[request] = task
+                    task.add_done_callback(
+                        lambda task, request=request: reply(request, task))
+                elif op == "cancel":
+                    task = tasks.get(message["id"])
+                    if task is not None:
+                        task.cancel()
+                else:
+                    self.handle(message)
+        except (ConnectionError, ValueError, KeyError) as err:
+            logger.warning(f"[ratelimit] shared limiter: dropping a client: {err!r}")
+        finally:
+            # A client that went away no longer wants its queued slots.
+            for task in list(tasks.values()):
+                task.cancel()
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+
+class SharedLimiter:
+    """
+    A client's handle on the shared limiters at ``address``: connects on first
+    use, or becomes the host if there is none, and transparently fails over
+    when the host goes away. ``local`` are the client's own limiters — the
+    template for hosting, and where the client records its own grants (it
+    does that itself; see CSGOEmpireClient._acquire).
+    """
+
+    def __init__(self, address: str, local: dict[str, _RateLimiter]):
+        self.address = address
+        self._tcp = _tcp_address(address)
+        if self._tcp is None and fcntl is None:
+            raise ValueError(
+                f"shared_limiter={address!r}: Unix sockets aren't available "
+                f"here, use a loopback \"127.0.0.1:PORT\" address")
+        self._local = local
+        self._host: Optional[LimiterHost] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connecting: Optional[asyncio.Task] = None
+        # Requests awaiting an answer, kept with their message so they can be
+        # re-sent to a new host; and cancelled acquires whose grant, if one
+        # still arrives, has to be refunded.
+        self._pending: dict[int, tuple[asyncio.Future, dict[str, Any]]] = {}
+        self._abandoned: dict[int, Optional[str]] = {}
+        self._next_id = 0
+        self._connected_once = False
+        self._closed = False
+
+    async def acquire(self, priority: int, bucket: Optional[str],
+                      deadline: Optional[float]) -> None:
+        """As ``_RateLimiter.acquire`` on the global limiter with ``bucket``'s
+        limiter as ``also``; raises DeadlineExceeded the same way."""
+        reply = await self._call({"op": "acquire", "priority": priority,
+                                  "bucket": bucket, "deadline": deadline})
+        if reply.get("error") == "deadline":
+            raise DeadlineExceeded("no rate-limit slot before the deadline")
+        if "at" not in reply:
+            raise CSGOEmpireError(f"Shared limiter: {reply.get('error')}")
+
+    async def try_acquire(self, priority: int, bucket: Optional[str],
+                          max_utilisation: float) -> bool:
+        """As ``_RateLimiter.try_acquire``: a slot only if it's spare now."""
+        reply = await self._call({"op": "try", "priority": priority,
+                                  "bucket": bucket,
+                                  "max_utilisation": max_utilisation})
+        return "at" in reply
+
+    def block_for(self, seconds: float) -> None:
+        """Pause every process (a 429 blocks the key, not the process). Lost
+        if no host is reachable right now — the local limiters still block."""
+        self._post({"op": "block", "seconds": seconds})
+
+    async def close(self) -> None:
+        self._closed = True
+        for task in (self._connecting, self._reader_task):
+            if task is not None:
+                task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._host is not None:
+            await self._host.stop()
+            self._host = None
+
+    # ------------------------------------------------------------------ #
+    # transport
+    # ------------------------------------------------------------------ #
+    async def _call(self, message: dict[str, Any]) -> dict[str, Any]:
+        if self._host is not None:
+            # This process hosts: no socket round trip.
+            return await self._host.answer(message)
+        self._next_id += 1
+        request = message["id"] = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request] = (future, message)
+        self._ensure_connected()
+        self._post(message)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if message["op"] == "acquire":
+                if self._pending.pop(request, None) is not None:
+                    self._abandoned[request] = message["bucket"]
+                    self._post({"op": "cancel", "id": request})
+                elif (future.done() and not future.cancelled()
+                      and "at" in future.result()):
+                    # Granted in the same tick the caller was cancelled.
+                    self._post({"op": "refund", "bucket": message["bucket"],
+                                "at": future.result()["at"]})
+            raise
+
+    def _post(self, message: dict[str, Any]) -> None:
+        """Send without waiting for an answer; dropped while disconnected
+        (queued requests are re-sent on reconnect from ``_pending``)."""
+        if self._host is not None:
+            self._host.handle(message)
+        elif self._writer is not None and not self._writer.is_closing():
+            self._writer.write(_encode(message))
+        else:
+            self._ensure_connected()
+
+    def _ensure_connected(self) -> None:
+        if (self._closed or self._host is not None or self._writer is not None
+                or self._connecting is not None):
+            return
+        self._connecting = asyncio.ensure_future(self._connect())
+        self._connecting.add_done_callback(self._connected)
+
+    def _connected(self, task: asyncio.Task) -> None:
+        self._connecting = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"[ratelimit] shared limiter: {task.exception()!r}")
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._tcp is not None:
+            return await asyncio.open_connection(*self._tcp)
+        return await asyncio.open_unix_connection(self.address)
+
+    async def _connect(self) -> None:
+        """Connect to the host, or become it; then replay what's queued."""
+        failover = self._connected_once
+        while not self._closed:
+            try:
+                reader, writer = await self._open()
+            except OSError:
+                if await self._become_host():
+                    return
+                await asyncio.sleep(ELECTION_RETRY)
+                continue
+            self._writer = writer
+            self._connected_once = True
+            self._abandoned.clear()
+            if failover:
+                # A new host knows nothing of the open windows; tell it ours.
+                self._post(self._restore_message())
+            for _, message in self._pending.values():
+                self._post(message)
+            self._reader_task = asyncio.ensure_future(self._read(reader, writer))
+            logger.info(f"[ratelimit] using the shared limiter at {self.address}")
+            return
+
+    async def _become_host(self) -> bool:
+        host = LimiterHost(self._local)
+        try:
+            await host.start(self.address)
+        except OSError:
+            return False
+        self._host = host
+        self._connected_once = True
+        host.handle(self._restore_message())
+        logger.info(f"[ratelimit] hosting the shared limiter at {self.address}")
+        # Requests queued with the old host are served here now.
+        for request, (future, message) in list(self._pending.items()):
+            del self._pending[request]
+            task = asyncio.ensure_future(host.answer(message))
+            task.add_done_callback(
+                lambda task, future=future: self._forward(task, future))
+            future.add_done_callback(lambda _, task=task: task.cancel())
+        return True
+
+    @staticmethod
+    def _forward(task: asyncio.Task, future: asyncio.Future) -> None:
+        if future.done():
+            return
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def _restore_message(self) -> dict[str, Any]:
+        return {"op": "restore",
+                "limiters": {name: limiter.snapshot()
+                             for name, limiter in self._local.items()}}
+
+    async def _read(self, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter) -> None:
+        try:
+            async for line in reader:
+                self._settle(json.loads(line))
+        except (ConnectionError, ValueError) as err:
+            logger.warning(f"[ratelimit] shared limiter connection: {err!r}")
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+            if not self._closed:
+                logger.warning("[ratelimit] shared limiter host went away — "
+                               "electing a new one")
+                self._ensure_connected()
+
+    def _settle(self, reply: dict[str, Any]) -> None:
+        request = reply.get("id")
+        entry = self._pending.pop(request, None)
+        if entry is None:
+            if request in self._abandoned:
+                bucket = self._abandoned.pop(request)
+                if "at" in reply:
+                    self._post({"op": "refund", "bucket": bucket,
+                                "at": reply["at"]})
+            return
+        future, _ = entry
+        if not future.done():
+            future.set_result(reply)
+
+
+def default_limiters(max_requests: int = 120, window: float = 60.0
+                     ) -> dict[str, _RateLimiter]:
+    """The limiters a default CSGOEmpireClient builds, by name."""
+    return {"global": _RateLimiter(max_requests, window, reserved=GLOBAL_RESERVED),
+            **{key: _RateLimiter(*spec["limit"])
+               for key, spec in ROUTES.items() if "limit" in spec}}
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    host = LimiterHost(default_limiters(args.max_requests, args.window))
+    await host.start(args.address)
+    print(f"Shared Empire rate limiter on {args.address} — Ctrl+C to stop")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await host.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Host the shared Empire rate limiter in its own process.")
+    parser.add_argument("address", help="socket path or 127.0.0.1:PORT")
+    parser.add_argument("--max-requests", type=int, default=120)
+    parser.add_argument("--window", type=float, default=60.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except OSError as err:
+        raise SystemExit(f"Can't host the shared limiter: {err} "
+                         f"(is another process hosting it?)")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+_BidScheduler: a queued bid whose task was cancelled stays in the queue until
+the task resumes, so a newer bid on the same item (or its deadline) can reach
+it first — that must not try to resolve its already-cancelled future.
+
+_BalanceLedger: a metadata sync already counts Empire's refunds, so a hold
+released after it must not add its coins back a second time.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+bidding_bot = pytest.importorskip("bidding_bot")
+
+
+def test_supersede_after_cancel_before_the_task_resumes():
+    async def scenario():
+        bids = bidding_bot._BidScheduler()
+        deadline = time.monotonic() + 60.0
+        assert await bids.acquire("a", 10, deadline) is None   # holds the slot
+        old = asyncio.ensure_future(bids.acquire("b", 10, deadline))
+        await asyncio.sleep(0)
+        assert "b" in bids._queue
+
+        # The newer bid runs before the cancelled one gets to clean up.
+        new = asyncio.ensure_future(bids.acquire("b", 20, deadline))
+        old.cancel()
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.CancelledError):
+            await old
+        assert bids.superseded == 0
+        assert bids._queue["b"].margin == 20
+
+        bids.release()
+        assert await new is None
+        assert bids.granted == 2
+
+    asyncio.run(scenario())
+
+
+def test_expiry_after_cancel_before_the_task_resumes():
+    async def scenario():
+        bids = bidding_bot._BidScheduler()
+        deadline = time.monotonic() + 60.0
+        assert await bids.acquire("a", 10, deadline) is None
+        old = asyncio.ensure_future(bids.acquire("b", 10, deadline))
+        await asyncio.sleep(0)
+        entry = bids._queue["b"]
+
+        old.cancel()
+        bids._expire(entry)
+        with pytest.raises(asyncio.CancelledError):
+            await old
+        assert bids.stale == 0
+        assert not bids._queue
+
+    asyncio.run(scenario())
+
+
+def test_release_after_sync_does_not_refund_twice():
+    ledger = bidding_bot._BalanceLedger()
+    ledger.sync(1000)
+    ledger.reserve("a", 300, None)
+    assert ledger.available == 700
+    # Metadata already reflects Empire's refund of the outbid bid...
+    assert ledger.sync(1000) == 300
+    # ...so the auction_update arriving after it refunds nothing more.
+    assert ledger.release("a") == 0
+    assert ledger.available == 1000
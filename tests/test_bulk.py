@@ -0,0 +1,47 @@
+"""
+CSGOEmpireClient._bulk: items are reported from Empire's per-item results, and
+an unexpected chunk failure still hands back what the other chunks did.
+"""
+
+import asyncio
+
+import pytest
+
+from csgoempire_client import (BULK_MAX_ITEMS, BulkError, CSGOEmpireClient,
+                               CSGOEmpireError)
+
+
+def _items(n: int) -> list[dict]:
+    return [{"id": i, "coin_value": 100} for i in range(n)]
+
+
+def test_rejected_item_in_an_accepted_chunk_is_failed():
+    async def send(chunk):
+        return {"success": True, "deposits": [
+            {"id": 1000 + item["id"], "item_id": item["id"],
+             "success": item["id"] != 3, "message": "not tradable"}
+            for item in chunk]}
+
+    report = asyncio.run(CSGOEmpireClient._bulk(send, _items(5)))
+    assert [item["id"] for item in report["sent"]] == [0, 1, 2, 4]
+    assert report["failed"] == [
+        {"item": {"id": 3, "coin_value": 100}, "error": "not tradable",
+         "status": None}]
+    assert len(report["responses"]) == 1
+
+
+def test_unexpected_error_keeps_the_chunks_that_landed():
+    async def send(chunk):
+        if chunk[0]["id"] == 0:
+            return {"success": True}
+        if chunk[0]["id"] == BULK_MAX_ITEMS:
+            raise CSGOEmpireError("rate limited", status=429)
+        raise ValueError("bad payload")
+
+    with pytest.raises(BulkError) as info:
+        asyncio.run(CSGOEmpireClient._bulk(send, _items(3 * BULK_MAX_ITEMS)))
+    report = info.value.report
+    assert [item["id"] for item in report["sent"]] == list(range(BULK_MAX_ITEMS))
+    statuses = [failure["status"] for failure in report["failed"]]
+    assert statuses == [429] * BULK_MAX_ITEMS + [None] * BULK_MAX_ITEMS
+    assert isinstance(info.value.__cause__, ValueError)
@@ -0,0 +1,105 @@
+"""
+_RateLimiter.acquire(also=...): the endpoint slot and the global slot are taken
+together, only once both are free, so a request queued on the global window
+never holds an endpoint slot it isn't using yet. Acquires made in the same
+tick compete by priority even for a slot that is free already.
+
+The limiters run on a fake clock and the test fires the armed timer itself,
+so nothing depends on how fast the machine sleeps.
+"""
+
+import asyncio
+
+import pytest
+
+from csgoempire_client import (PRIORITY_BID, PRIORITY_HIGH, PRIORITY_NORMAL,
+                               _RateLimiter)
+
+WINDOW = 10.0
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _exhausted_global(clock: _Clock) -> _RateLimiter:
+    limiter = _RateLimiter(1, WINDOW, clock=clock)
+    assert limiter.try_acquire()
+    return limiter
+
+
+def _fire_timer(limiter: _RateLimiter) -> None:
+    """Run the limiter's armed timer now instead of after a real sleep."""
+    assert limiter._timer is not None
+    limiter._timer.cancel()
+    limiter._on_timer()
+
+
+def test_endpoint_slot_untouched_while_global_is_exhausted():
+    async def scenario():
+        clock = _Clock()
+        global_limiter = _exhausted_global(clock)
+        endpoint = _RateLimiter(2, 60.0, clock=clock)
+        task = asyncio.ensure_future(
+            global_limiter.acquire(PRIORITY_BID, also=(endpoint,)))
+        await asyncio.sleep(0)
+        assert not task.done()
+        assert global_limiter._timer_at == WINDOW
+        assert len(endpoint._timestamps) == 0
+        assert len(global_limiter._timestamps) == 1
+
+        clock.now = WINDOW
+        _fire_timer(global_limiter)
+        assert await task == WINDOW
+        assert list(endpoint._timestamps) == [WINDOW]
+        assert list(global_limiter._timestamps) == [WINDOW]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_both_buckets_untouched():
+    async def scenario():
+        clock = _Clock()
+        global_limiter = _exhausted_global(clock)
+        endpoint = _RateLimiter(2, 60.0, clock=clock)
+        before = list(global_limiter._timestamps)
+        task = asyncio.ensure_future(
+            global_limiter.acquire(PRIORITY_BID, also=(endpoint,)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert global_limiter._queued == 0
+        assert not global_limiter._queues
+        assert global_limiter._timer is None
+        # Past the point the waiter would have been granted: nothing is.
+        clock.now = WINDOW * 1.5
+        global_limiter._schedule()
+        assert len(endpoint._timestamps) == 0
+        assert list(global_limiter._timestamps) == before
+
+    asyncio.run(scenario())
+
+
+def test_same_tick_acquires_are_granted_by_priority():
+    async def scenario():
+        clock = _Clock()
+        limiter = _RateLimiter(1, WINDOW, clock=clock)
+        normal = asyncio.ensure_future(limiter.acquire(PRIORITY_NORMAL))
+        high = asyncio.ensure_future(limiter.acquire(PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        assert not normal.done() and not high.done()
+
+        _fire_timer(limiter)
+        assert await high == 0.0
+        assert not normal.done()
+        clock.now = WINDOW
+        _fire_timer(limiter)
+        assert await normal == WINDOW
+
+    asyncio.run(scenario())
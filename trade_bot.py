@@ -67,7 +67,8 @@ class TradeBot:
     async def update_automation_loop(self) -> None:
         while True:
             try:
-                status = await self.empire.get_automation_status()
+                # Fresh: this read follows a sleep until the token expired.
+                status = await self.empire.get_automation_status(fresh=True)
                 if status.get('success'):
                     data = status.get('data', {})
 